@@ -0,0 +1,258 @@
+"""Load and latency benchmark for the API.
+
+Scenarios: register, login, list (at several table sizes) and create, each run with a
+configurable number of concurrent clients. Results are printed as JSON with throughput
+and p50/p95/p99 latency per scenario; pass ``--baseline`` with an earlier report to fail
+when p95 latency regresses by more than ``--max-regression``.
+
+By default the app runs in-process over ASGI against a throwaway SQLite file. Use
+``--uvicorn`` to launch a real server process, or ``--base-url`` to target a running one.
+
+Usage:
+    python benchmarks/bench_api.py --concurrency 1 8 --requests 200 --list-sizes 100 10000
+    python benchmarks/bench_api.py --uvicorn --output run.json
+    python benchmarks/bench_api.py --baseline run.json --max-regression 0.2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+
+import httpx
+
+PASSWORD = "BenchPass123!"
+SEED_BATCH = 500
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _run_scenario(
+    http: httpx.AsyncClient, name: str, request: Request, total: int, concurrency: int
+) -> dict:
+    latencies: list[float] = []
+    errors = rate_limited = 0
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal errors, rate_limited, next_index
+        while next_index < total:
+            index = next_index
+            next_index += 1
+            started = time.perf_counter()
+            try:
+                response = await request(http, index)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = None
+            latencies.append(time.perf_counter() - started)
+            # A 429 means the limiter answered, not the endpoint; report it separately.
+            rate_limited += status == 429
+            errors += status != 429 and (status is None or status >= 400)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "rate_limited": rate_limited,
+        "throughput_rps": round(total / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+    }
+
+
+async def _login(http: httpx.AsyncClient, username: str) -> dict[str, str]:
+    await http.post("/auth/register", json={"username": username, "password": PASSWORD})
+    res = await http.post("/auth/login", json={"username": username, "password": PASSWORD})
+    res.raise_for_status()
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+async def _seed_posts(http: httpx.AsyncClient, headers: dict[str, str], count: int) -> None:
+    post = {"title": "Seeded post", "content": "Seeded body text " * 20}
+    for offset in range(0, count, SEED_BATCH):
+        batch = [post] * min(SEED_BATCH, count - offset)
+        res = await http.post("/api/posts/batch", headers=headers, json=batch)
+        res.raise_for_status()
+
+
+async def _benchmark(http: httpx.AsyncClient, args: argparse.Namespace) -> list[dict]:
+    run_id = uuid.uuid4().hex[:6]
+    login_user = f"bench_login_{run_id}"
+    headers = await _login(http, login_user)
+    results = []
+
+    async def register(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        username = f"bench_{run_id}_{len(results)}_{index}"
+        return await client.post(
+            "/auth/register", json={"username": username, "password": PASSWORD}
+        )
+
+    async def login(client: httpx.AsyncClient, _: int) -> httpx.Response:
+        return await client.post("/auth/login", json={"username": login_user, "password": PASSWORD})
+
+    async def list_first_page(client: httpx.AsyncClient, _: int) -> httpx.Response:
+        return await client.get("/api/posts", headers=headers)
+
+    async def create(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        post = {"title": f"Bench post {index}", "content": "Benchmark body " * 10}
+        return await client.post("/api/posts", headers=headers, json=post)
+
+    for concurrency in args.concurrency:
+        # bcrypt-bound scenarios get fewer requests so a run stays in minutes, not hours.
+        auth_requests = max(concurrency, args.requests // 10)
+        results.append(await _run_scenario(http, "register", register, auth_requests, concurrency))
+        results.append(await _run_scenario(http, "login", login, auth_requests, concurrency))
+
+    seeded = 0
+    for size in sorted(args.list_sizes):
+        await _seed_posts(http, headers, size - seeded)
+        seeded = size
+        for concurrency in args.concurrency:
+            result = await _run_scenario(http, "list", list_first_page, args.requests, concurrency)
+            results.append({**result, "table_size": size})
+
+    for concurrency in args.concurrency:
+        results.append(await _run_scenario(http, "create", create, args.requests, concurrency))
+    return results
+
+
+@contextlib.asynccontextmanager
+async def _in_process_client() -> AsyncIterator[httpx.AsyncClient]:
+    from app.main import app, lifespan
+
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            yield http
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def _uvicorn_client(workers: int) -> AsyncIterator[httpx.AsyncClient]:
+    port = _free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        env=os.environ.copy(),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as http:
+            for _ in range(100):
+                with contextlib.suppress(httpx.HTTPError):
+                    await http.get("/docs")
+                    break
+                await asyncio.sleep(0.1)
+            yield http
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+@contextlib.asynccontextmanager
+async def _remote_client(base_url: str) -> AsyncIterator[httpx.AsyncClient]:
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as http:
+        yield http
+
+
+def _regressions(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    def key(result: dict) -> tuple:
+        return result["scenario"], result["concurrency"], result.get("table_size")
+
+    previous = {key(result): result for result in baseline}
+    messages = []
+    for result in results:
+        before = previous.get(key(result))
+        if before and result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            messages.append(f"{key(result)}: p95 {before['p95_ms']} ms -> {result['p95_ms']} ms")
+    return messages
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--list-sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--uvicorn", action="store_true", help="launch a uvicorn server")
+    target.add_argument("--base-url", help="benchmark an already running server")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --uvicorn")
+    parser.add_argument("--output", type=Path, help="also write the JSON report to a file")
+    parser.add_argument("--baseline", type=Path, help="earlier report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    async def run() -> list[dict]:
+        if args.base_url:
+            client = _remote_client(args.base_url)
+        elif args.uvicorn:
+            client = _uvicorn_client(args.workers)
+        else:
+            client = _in_process_client()
+        async with client as http:
+            return await _benchmark(http, args)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.base_url:
+            os.environ.setdefault("APP_DATABASE_URL", f"sqlite:///{Path(tmp) / 'bench.db'}")
+            # Every request comes from one address and login reuses one username.
+            os.environ.setdefault("APP_AUTH_RATE_LIMIT_ENABLED", "false")
+        results = asyncio.run(run())
+
+    report = {"measured_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = _regressions(results, baseline, args.max_regression)
+        for message in regressions:
+            print(f"regression: {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
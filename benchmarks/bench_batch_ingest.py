@@ -0,0 +1,69 @@
+"""Compare posts/second for one-at-a-time POST /api/posts against POST /api/posts/batch.
+
+Runs the app in-process over ASGI against a throwaway SQLite file.
+
+Usage: python benchmarks/bench_batch_ingest.py [--posts 1000] [--batch-size 250]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+_TMP = tempfile.TemporaryDirectory()
+os.environ.setdefault("APP_DATABASE_URL", f"sqlite:///{Path(_TMP.name) / 'bench.db'}")
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+PASSWORD = "BenchPass123!"
+
+
+async def _login(http: httpx.AsyncClient) -> dict[str, str]:
+    await http.post("/auth/register", json={"username": "bench_user", "password": PASSWORD})
+    res = await http.post("/auth/login", json={"username": "bench_user", "password": PASSWORD})
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+async def _bench(posts: int, batch_size: int) -> dict:
+    payload = {"title": "Ingested <b>post</b>", "content": "Body text " * 30}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        headers = await _login(http)
+
+        started = time.perf_counter()
+        for _ in range(posts):
+            res = await http.post("/api/posts", headers=headers, json=payload)
+            res.raise_for_status()
+        single = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for offset in range(0, posts, batch_size):
+            chunk = [payload] * min(batch_size, posts - offset)
+            res = await http.post("/api/posts/batch", headers=headers, json=chunk)
+            res.raise_for_status()
+        batched = time.perf_counter() - started
+
+    return {
+        "posts": posts,
+        "batch_size": batch_size,
+        "single_posts_per_second": round(posts / single, 1),
+        "batch_posts_per_second": round(posts / batched, 1),
+        "speedup": round(single / batched, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=250)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_bench(args.posts, args.batch_size))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Check that GET /api/posts/export keeps memory flat as the table grows.
+
+Seeds each table size into a throwaway SQLite file, streams the full export by calling
+the ASGI app directly (httpx's ASGI transport would buffer the whole body) and reports
+rows/second and the tracemalloc peak while streaming.
+
+Usage: python benchmarks/bench_export.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+_TMP = tempfile.TemporaryDirectory()
+os.environ.setdefault("APP_DATABASE_URL", f"sqlite:///{Path(_TMP.name) / 'bench.db'}")
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app import models, schemas  # noqa: E402
+from app.db import get_engine  # noqa: E402
+from app.main import app, lifespan  # noqa: E402
+
+PASSWORD = "BenchPass123!"
+
+
+def _seed(count: int) -> None:
+    row = {
+        "title": "Exported post",
+        "content": "Body text " * 30,
+        "owner_id": 1,
+        "sanitizer_version": schemas.SANITIZER_VERSION,
+    }
+    with get_engine().begin() as conn:
+        for offset in range(0, count, 5000):
+            conn.execute(insert(models.Post), [row] * min(5000, count - offset))
+
+
+async def _stream_export(token: str) -> int:
+    """Drive the ASGI app by hand, counting lines and discarding each body chunk."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/posts/export",
+        "raw_path": b"/api/posts/export",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    lines = 0
+    requested = False
+    never = asyncio.Event()
+
+    async def receive() -> dict:
+        nonlocal requested
+        if requested:
+            await never.wait()  # the client never disconnects
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        nonlocal lines
+        if message["type"] == "http.response.body":
+            lines += message.get("body", b"").count(b"\n")
+
+    await app(scope, receive, send)
+    return lines
+
+
+async def _bench(sizes: list[int]) -> list[dict]:
+    results = []
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            await http.post("/auth/register", json={"username": "bench", "password": PASSWORD})
+            res = await http.post("/auth/login", json={"username": "bench", "password": PASSWORD})
+            token = res.json()["access_token"]
+
+            seeded = 0
+            for size in sorted(sizes):
+                _seed(size - seeded)
+                seeded = size
+                tracemalloc.start()
+                started = time.perf_counter()
+                rows = await _stream_export(token)
+                elapsed = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                results.append(
+                    {
+                        "rows": rows,
+                        "rows_per_second": round(rows / elapsed, 1),
+                        "peak_traced_mib": round(peak / 2**20, 2),
+                    }
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_bench(args.sizes)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
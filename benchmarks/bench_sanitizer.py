@@ -0,0 +1,60 @@
+"""Compare per-call bleach.clean with app.sanitizer on plain and markup-heavy text.
+
+Usage: python benchmarks/bench_sanitizer.py [--strings 2000] [--repeat 5]
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+
+import bleach
+
+from app import sanitizer
+
+CORPORA = {
+    "plain": "An ordinary post body with no markup at all, just words. " * 8,
+    "markup": 'Hello <b>world</b> <script>alert(1)</script> <a href="https://x.y">x</a> & co. ' * 8,
+}
+
+
+def _best_of(func: Callable[[list[str]], object], values: list[str], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(values)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--strings", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    for name, text in CORPORA.items():
+        values = [f"{text}{idx}" for idx in range(args.strings)]
+        baseline = _best_of(
+            lambda batch: [bleach.clean(value, strip=True) for value in batch], values, args.repeat
+        )
+        single = _best_of(
+            lambda batch: [sanitizer.clean(value) for value in batch], values, args.repeat
+        )
+        batched = _best_of(sanitizer.clean_many, values, args.repeat)
+        results.append(
+            {
+                "corpus": name,
+                "strings": args.strings,
+                "bleach_clean_seconds": round(baseline, 4),
+                "sanitizer_clean_seconds": round(single, 4),
+                "sanitizer_clean_many_seconds": round(batched, 4),
+                "speedup": round(baseline / batched, 1),
+            }
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare the cost of serializing a post listing.
+
+Measures Pydantic ``PostPage`` with legacy rows (re-sanitized on output), Pydantic with
+versioned rows, and the orjson fast path used by the list endpoints.
+
+Usage: python benchmarks/bench_serialization.py [--rows 5000] [--repeat 5]
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+
+from app import models, schemas
+from app.serialization import encode_post_page
+
+
+def _rows(count: int, sanitizer_version: int | None) -> list[models.Post]:
+    return [
+        models.Post(
+            id=idx,
+            title=f"Post number {idx} about <b>things</b>",
+            content="Some already cleaned body text &amp; more. " * 20,
+            owner_id=1,
+            created_at=datetime(2024, 1, 1),
+            sanitizer_version=sanitizer_version,
+        )
+        for idx in range(count)
+    ]
+
+
+def _best_of(encode, rows: list[models.Post], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encode(rows)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def _pydantic(rows: list[models.Post]) -> bytes:
+    return schemas.PostPage(items=rows).model_dump_json().encode()
+
+
+def _fast_path(rows: list[models.Post]) -> bytes:
+    return encode_post_page(rows, None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    legacy = _best_of(_pydantic, _rows(args.rows, None), args.repeat)
+    versioned = _rows(args.rows, schemas.SANITIZER_VERSION)
+    current = _best_of(_pydantic, versioned, args.repeat)
+    fast = _best_of(_fast_path, versioned, args.repeat)
+    print(
+        json.dumps(
+            {
+                "rows": args.rows,
+                "resanitize_seconds": round(legacy, 4),
+                "versioned_seconds": round(current, 4),
+                "fast_path_seconds": round(fast, 4),
+                "speedup": round(legacy / current, 1),
+                "fast_path_speedup": round(current / fast, 1),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Concurrent POST /api/posts throughput with posts on the primary versus on N shards.
+
+Runs the app in-process over ASGI against throwaway SQLite files. Every client posts as
+its own user, so with shards the writes spread across files by owner.
+
+Usage: python benchmarks/bench_sharding.py [--shards 4] [--clients 16] [--posts 50]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+_TMP = tempfile.TemporaryDirectory()
+os.environ.setdefault("APP_DATABASE_URL", f"sqlite:///{Path(_TMP.name) / 'bench.db'}")
+os.environ.setdefault("APP_BCRYPT_CALIBRATE_ON_STARTUP", "false")
+os.environ.setdefault("APP_AUTH_RATE_LIMIT_ENABLED", "false")
+
+import httpx  # noqa: E402
+
+from app.db import create_schema, make_engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.sharding import PostShards, create_shard_schema, get_post_shards  # noqa: E402
+
+PASSWORD = "BenchPass123!"
+
+
+async def _login(http: httpx.AsyncClient, username: str) -> dict[str, str]:
+    await http.post("/auth/register", json={"username": username, "password": PASSWORD})
+    res = await http.post("/auth/login", json={"username": username, "password": PASSWORD})
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+async def _run(http: httpx.AsyncClient, logins: list[dict[str, str]], posts: int) -> float:
+    payload = {"title": "Sharded post", "content": "Body text " * 30}
+
+    async def client(headers: dict[str, str]) -> None:
+        for _ in range(posts):
+            res = await http.post("/api/posts", headers=headers, json=payload)
+            res.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(headers) for headers in logins))
+    return time.perf_counter() - started
+
+
+async def _bench(shard_count: int, clients: int, posts: int) -> dict:
+    create_schema()
+    urls = [f"sqlite:///{Path(_TMP.name) / f'shard{index}.db'}" for index in range(shard_count)]
+    for url in urls:
+        engine = make_engine(url)
+        create_shard_schema(engine)
+        engine.dispose()
+    shards = PostShards(urls)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        logins = [await _login(http, f"bench_{index}") for index in range(clients)]
+        primary = await _run(http, logins, posts)
+        app.dependency_overrides[get_post_shards] = lambda: shards
+        sharded = await _run(http, logins, posts)
+        app.dependency_overrides.clear()
+
+    total = clients * posts
+    return {
+        "clients": clients,
+        "posts": total,
+        "shards": shard_count,
+        "owners_per_shard": [
+            sum(1 for index in range(1, clients + 1) if shards.index_for(index) == shard)
+            for shard in range(shard_count)
+        ],
+        "primary_posts_per_second": round(total / primary, 1),
+        "sharded_posts_per_second": round(total / sharded, 1),
+        "speedup": round(primary / sharded, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--posts", type=int, default=50, help="posts per client")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_bench(args.shards, args.clients, args.posts)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
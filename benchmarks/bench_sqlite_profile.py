@@ -0,0 +1,98 @@
+"""Mixed read/write load against a SQLite file with the tuning profile on and off.
+
+Writers insert posts one transaction at a time while readers page through the feed
+index, mirroring create_post and list_posts. Each run uses a fresh database file.
+
+Usage: python benchmarks/bench_sqlite_profile.py [--seconds 5] [--readers 4] [--writers 2]
+"""
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.db import Base, make_engine
+
+
+def _run(tuning: bool, seconds: float, readers: int, writers: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", tuning=tuning)
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine)
+        with factory() as session:
+            session.add(models.User(username="bench", password_hash="x"))
+            session.commit()
+
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def write() -> None:
+            while time.perf_counter() < deadline:
+                try:
+                    with factory() as session:
+                        session.add(
+                            models.Post(
+                                title="t", content="c" * 200, owner_id=1, created_at=datetime.now()
+                            )
+                        )
+                        session.commit()
+                    key = "writes"
+                except OperationalError:
+                    key = "errors"
+                with lock:
+                    counts[key] += 1
+
+        def read() -> None:
+            stmt = (
+                select(models.Post)
+                .order_by(models.Post.created_at.desc(), models.Post.id.desc())
+                .limit(50)
+            )
+            while time.perf_counter() < deadline:
+                try:
+                    with factory() as session:
+                        session.scalars(stmt).all()
+                    key = "reads"
+                except OperationalError:
+                    key = "errors"
+                with lock:
+                    counts[key] += 1
+
+        threads = [threading.Thread(target=write) for _ in range(writers)]
+        threads += [threading.Thread(target=read) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    return {
+        "tuning": tuning,
+        "reads_per_second": round(counts["reads"] / seconds, 1),
+        "writes_per_second": round(counts["writes"] / seconds, 1),
+        "errors": counts["errors"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    args = parser.parse_args()
+
+    results = [_run(tuning, args.seconds, args.readers, args.writers) for tuning in (False, True)]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
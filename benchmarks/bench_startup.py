@@ -0,0 +1,108 @@
+"""Measure cold import and startup cost of the app, with an optional budget check.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter, reports the
+cumulative import time and the slowest top-level packages, then times the app lifespan
+startup (schema setup) separately. Exits non-zero when a budget is exceeded.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--import-budget-ms 1500]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+STARTUP_SNIPPET = """
+import asyncio, time
+started = time.perf_counter()
+from app.main import app, lifespan
+imported = time.perf_counter()
+
+async def start():
+    async with lifespan(app):
+        pass
+
+asyncio.run(start())
+print(imported - started, time.perf_counter() - imported)
+"""
+
+
+def _importtime(env: dict[str, str]) -> tuple[int, dict[str, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    total = 0
+    packages: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.split("|"))
+        if not cumulative.isdigit():
+            continue
+        top = name.split(".")[0]
+        packages[top] = max(packages.get(top, 0), int(cumulative))
+        if name == "app.main":
+            total = int(cumulative)
+    return total, packages
+
+
+def _startup(env: dict[str, str]) -> tuple[float, float]:
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SNIPPET], capture_output=True, text=True, env=env, check=True
+    )
+    imported, started = result.stdout.split()
+    return float(imported), float(started)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=None)
+    parser.add_argument("--startup-budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "APP_DATABASE_URL": f"sqlite:///{Path(tmp) / 'startup.db'}"}
+        imports = [_importtime(env) for _ in range(args.runs)]
+        startups = []
+        for _ in range(args.runs):
+            Path(tmp, "startup.db").unlink(missing_ok=True)
+            startups.append(_startup(env))
+
+    import_ms = statistics.median(total for total, _ in imports) / 1000
+    slowest = sorted(imports[-1][1].items(), key=lambda item: item[1], reverse=True)[:8]
+    report = {
+        "runs": args.runs,
+        "import_app_main_ms": round(import_ms, 1),
+        "lifespan_startup_ms": round(statistics.median(s for _, s in startups) * 1000, 1),
+        "slowest_packages_ms": {name: round(us / 1000, 1) for name, us in slowest},
+        "measured_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    print(json.dumps(report, indent=2))
+
+    failed = False
+    if args.import_budget_ms is not None and import_ms > args.import_budget_ms:
+        print(f"import budget exceeded: {import_ms:.1f} > {args.import_budget_ms} ms")
+        failed = True
+    if (
+        args.startup_budget_ms is not None
+        and report["lifespan_startup_ms"] > args.startup_budget_ms
+    ):
+        print(
+            f"startup budget exceeded: {report['lifespan_startup_ms']} > {args.startup_budget_ms}"
+        )
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,149 @@
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import asdict
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+
+from app.config import get_settings
+from app.db import create_schema, get_engine, get_sessionmaker
+
+
+def _init_db(_: argparse.Namespace) -> int:
+    from app.sharding import create_shard_schemas
+
+    settings = get_settings()
+    create_schema()
+    create_shard_schemas()
+    for url in [settings.database_url, *settings.post_shard_urls]:
+        print(f"Schema is up to date at {make_url(url).render_as_string(hide_password=True)}")
+    return 0
+
+
+def _hash_report(_: argparse.Namespace) -> int:
+    from app import models
+    from app.security import bcrypt_cost, get_bcrypt_rounds
+
+    rounds = get_bcrypt_rounds()
+    costs: Counter[str] = Counter()
+    with get_sessionmaker()() as db:
+        for password_hash in db.scalars(select(models.User.password_hash)).yield_per(1000):
+            cost = bcrypt_cost(password_hash)
+            costs["other" if cost is None else str(cost)] += 1
+
+    below = sum(count for cost, count in costs.items() if cost.isdigit() and int(cost) < rounds)
+    report = {
+        "current_rounds": rounds,
+        "users": sum(costs.values()),
+        "costs": dict(sorted(costs.items(), key=lambda item: item[0].zfill(3))),
+        "below_current": below,
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+def _reconcile_stats(_: argparse.Namespace) -> int:
+    from app.db import make_engine
+    from app.stats import reconcile_feed_totals, reconcile_stats
+
+    with get_engine().begin() as conn:
+        result = reconcile_stats(conn)
+    shard_urls = get_settings().post_shard_urls
+    for url in shard_urls:
+        engine = make_engine(url)
+        try:
+            with engine.begin() as conn:
+                reconcile_feed_totals(conn)
+        finally:
+            engine.dispose()
+    if shard_urls:
+        result["shards"] = len(shard_urls)
+    print(json.dumps(result))
+    return 0
+
+
+def _rebalance_shards(args: argparse.Namespace) -> int:
+    from app.sharding import rebalance_posts
+
+    shard_urls = get_settings().post_shard_urls
+    if not shard_urls:
+        print("APP_POST_SHARD_URLS is not set", file=sys.stderr)
+        return 2
+    report = rebalance_posts(shard_urls, args.source, batch_size=args.batch_size)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+def _import_users(args: argparse.Namespace) -> int:
+    from app.importer import import_users, read_user_rows
+    from app.security import get_bcrypt_rounds
+
+    report = import_users(
+        get_engine(),
+        read_user_rows(args.path, args.format),
+        rounds=get_bcrypt_rounds(),
+        workers=args.workers,
+        batch_size=args.batch_size,
+    )
+    # One JSON object per failed row on stderr, the summary on stdout.
+    for failure in report.failures:
+        print(json.dumps(asdict(failure)), file=sys.stderr)
+    print(json.dumps(report.summary(), indent=2))
+    return 1 if report.failures else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="infosec-api", description="Infosec Lab API tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init_db = commands.add_parser("init-db", help="create missing tables and indexes")
+    init_db.set_defaults(handler=_init_db)
+
+    hash_report = commands.add_parser(
+        "hash-report", help="show how many stored password hashes use each bcrypt cost"
+    )
+    hash_report.set_defaults(handler=_hash_report)
+
+    reconcile = commands.add_parser(
+        "reconcile-stats", help="rebuild the denormalized post counters from the posts table"
+    )
+    reconcile.set_defaults(handler=_reconcile_stats)
+
+    rebalance = commands.add_parser(
+        "rebalance-shards", help="move posts to their owner's shard after the shard list changes"
+    )
+    rebalance.add_argument(
+        "--source",
+        action="append",
+        default=[],
+        metavar="URL",
+        help="extra database to drain: a retired shard, or database_url when enabling sharding",
+    )
+    rebalance.add_argument("--batch-size", type=int, default=1000)
+    rebalance.set_defaults(handler=_rebalance_shards)
+
+    import_cmd = commands.add_parser(
+        "import-users", help="create users from a CSV or JSON Lines file of username,password"
+    )
+    import_cmd.add_argument("path", type=Path)
+    import_cmd.add_argument(
+        "--format", choices=["csv", "jsonl"], help="default: guessed from the file extension"
+    )
+    import_cmd.add_argument("--batch-size", type=int, default=1000)
+    import_cmd.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    import_cmd.set_defaults(handler=_import_users)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,130 @@
+import asyncio
+import contextlib
+from collections.abc import Sequence
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import models
+from app.config import get_settings
+from app.db import get_async_sessionmaker, insert_returning
+from app.feed import bump_feed_version
+from app.metrics import post_write_batch_size
+from app.sharding import PostShards, get_post_shards, write_posts
+from app.stats import record_new_posts
+
+settings = get_settings()
+
+
+class PostWriteCoalescer:
+    """Group commit for post inserts.
+
+    Concurrent :meth:`submit` calls are held for up to ``window_seconds`` (or until
+    ``max_batch`` rows are waiting) and written with one multi-row INSERT and a single
+    commit, so a burst pays for one write lock and one fsync instead of one per post.
+    Batches are flushed one at a time; rows arriving during a flush form the next batch.
+    A failed transaction fails every caller in its batch.
+
+    With ``shard_index`` set the session factory is that post shard's and rows are
+    written with :func:`app.sharding.write_posts`.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        window_seconds: float,
+        max_batch: int,
+        shard_index: int | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.shard_index = shard_index
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self._pending: list[tuple[dict[str, Any], asyncio.Future]] = []
+        self._full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._collector: asyncio.Task | None = None
+
+    async def submit(self, values: dict[str, Any]) -> tuple[int, datetime]:
+        """Queue one post row; resolves with its id and created_at once committed."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((values, future))
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        if self._collector is None:
+            self._collector = asyncio.create_task(self._collect())
+        return await future
+
+    async def _collect(self) -> None:
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._full.wait(), self.window_seconds)
+        batch = self._pending[: self.max_batch]
+        del self._pending[: self.max_batch]
+        self._full.clear()
+        # Let the next batch start collecting while this one is written.
+        self._collector = None
+        if self._pending:
+            if len(self._pending) >= self.max_batch:
+                self._full.set()
+            self._collector = asyncio.create_task(self._collect())
+
+        async with self._flush_lock:
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[tuple[dict[str, Any], asyncio.Future]]) -> None:
+        try:
+            async with self.session_factory() as db:
+                rows = await self._write(db, [values for values, _ in batch])
+                await db.commit()
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        post_write_batch_size.observe(len(batch))
+        for (_, future), row in zip(batch, rows, strict=True):
+            if not future.done():  # the caller may have gone away meanwhile
+                future.set_result((row.id, row.created_at))
+
+    async def _write(self, db: AsyncSession, values: list[dict[str, Any]]) -> Sequence:
+        if self.shard_index is not None:
+            return await write_posts(db, self.shard_index, values)
+        posts = await insert_returning(db, models.Post, values)
+        await record_new_posts(db, [(post.owner_id, post.created_at) for post in posts])
+        await bump_feed_version(db)
+        return posts
+
+
+class ShardedPostWriteCoalescer:
+    """One :class:`PostWriteCoalescer` per post shard; each post joins its owner's shard."""
+
+    def __init__(self, shards: PostShards, window_seconds: float, max_batch: int) -> None:
+        self.shards = shards
+        self.coalescers = [
+            PostWriteCoalescer(factory, window_seconds, max_batch, shard_index=index)
+            for index, factory in enumerate(shards.session_factories)
+        ]
+
+    async def submit(self, values: dict[str, Any]) -> tuple[int, datetime]:
+        return await self.coalescers[self.shards.index_for(values["owner_id"])].submit(values)
+
+
+@lru_cache
+def get_post_coalescer() -> PostWriteCoalescer | ShardedPostWriteCoalescer | None:
+    """Dependency returning the shared coalescer, or None when coalescing is disabled."""
+    if not settings.post_write_coalescing_enabled:
+        return None
+    window_seconds = settings.post_write_coalesce_window_ms / 1000
+    shards = get_post_shards()
+    if shards is not None:
+        return ShardedPostWriteCoalescer(
+            shards, window_seconds, max_batch=settings.post_write_coalesce_max_batch
+        )
+    return PostWriteCoalescer(
+        get_async_sessionmaker(),
+        window_seconds=window_seconds,
+        max_batch=settings.post_write_coalesce_max_batch,
+    )
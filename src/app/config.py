@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,6 +12,59 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
     database_url: str = "sqlite:///./app.db"
+    # Optional post shards (SQLite URLs). When set, posts are partitioned by owner across
+    # them and database_url keeps users; run `infosec-api rebalance-shards` after changes.
+    post_shard_urls: list[str] = []
+    # Optional read replica for read-only endpoints; writes always go to database_url.
+    read_database_url: str | None = None
+    # Run create_all from the app lifespan; disable when `infosec-api init-db` owns the schema.
+    create_schema_on_startup: bool = True
+    # Connection pool for server databases (PostgreSQL, MySQL); ignored for SQLite.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # Production SQLite profile applied to every new connection when enabled.
+    sqlite_tuning_enabled: bool = False
+    sqlite_journal_mode: Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL"] = "WAL"
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size: int = -64000  # negative values are KiB, i.e. 64 MiB
+    sqlite_mmap_size: int = 268435456
+    sqlite_temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    # bcrypt cost: calibrated at startup to the cost whose hash time is closest to the
+    # target, within [min, max]; bcrypt_rounds is used as-is when calibration is off.
+    bcrypt_calibrate_on_startup: bool = True
+    bcrypt_target_ms: float = 250
+    bcrypt_rounds: int = 12
+    bcrypt_min_rounds: int = 10
+    bcrypt_max_rounds: int = 15
+    password_hash_workers: int = 2
+    password_hash_queue_size: int = 32
+    password_hash_retry_after_seconds: int = 1
+    # Token buckets for /auth/login and /auth/register, checked before any bcrypt work.
+    auth_rate_limit_enabled: bool = True
+    auth_ip_rate_per_minute: float = 60
+    auth_ip_burst: int = 30
+    auth_username_rate_per_minute: float = 10
+    auth_username_burst: int = 10
+    auth_rate_limit_max_keys: int = 10000
+    principal_cache_size: int = 1024
+    principal_cache_ttl_seconds: int = 60
+    feed_cache_size: int = 256
+    post_batch_max_items: int = 500
+    # Group commit for POST /api/posts: concurrent inserts wait up to the window (or until
+    # the batch is full) and are committed in one transaction.
+    post_write_coalescing_enabled: bool = False
+    post_write_coalesce_window_ms: float = 2.0
+    post_write_coalesce_max_batch: int = 64
+    export_chunk_size: int = 1000
+    metrics_enabled: bool = True
+    # Staging only: profile requests carrying the header (matching the token, if set)
+    # plus a random sample, writing pstats/collapsed-stack dumps to profiling_dir.
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.0
+    profiling_header: str = "X-Profile"
+    profiling_token: str | None = None
+    profiling_dir: str = "profiles"
 
     model_config = SettingsConfigDict(
         env_file=".env",
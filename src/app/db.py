@@ -1,26 +1,270 @@
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator, Sequence
+from functools import lru_cache
+from typing import Any
 
-from sqlalchemy import create_engine
+from fastapi import Depends, Request
+from sqlalchemy import Connection, Engine, create_engine, event, insert, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.schema import CreateColumn
 
-from app.config import get_settings
+from app.config import Settings, get_settings
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {},
-)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# Clients send this header (any value but "0"/"false") to read from the primary, e.g. right
+# after a write that the replica may not have replayed yet.
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+# Sync drivers that have a drop-in asyncio counterpart for the same database URL.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+}
+
+
+def _connect_args(url: str) -> dict:
+    return {"check_same_thread": False} if url.startswith("sqlite") else {}
+
+
+def _engine_options(url: str) -> dict:
+    options: dict = {"connect_args": _connect_args(url)}
+    if not url.startswith("sqlite"):
+        options.update(pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow)
+    return options
+
+
+def sqlite_pragmas(config: Settings) -> list[str]:
+    # Every value is an int or a Literal validated by Settings, so formatting is safe.
+    return [
+        f"PRAGMA journal_mode={config.sqlite_journal_mode}",
+        f"PRAGMA synchronous={config.sqlite_synchronous}",
+        f"PRAGMA busy_timeout={int(config.sqlite_busy_timeout_ms)}",
+        f"PRAGMA cache_size={int(config.sqlite_cache_size)}",
+        f"PRAGMA mmap_size={int(config.sqlite_mmap_size)}",
+        f"PRAGMA temp_store={config.sqlite_temp_store}",
+    ]
+
+
+def install_sqlite_tuning(engine: Engine, config: Settings | None = None) -> None:
+    """Apply the SQLite tuning profile from ``config`` to each new connection of ``engine``."""
+    pragmas = sqlite_pragmas(config or settings)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def _tuning_enabled(url: str, tuning: bool | None) -> bool:
+    enabled = settings.sqlite_tuning_enabled if tuning is None else tuning
+    return enabled and url.startswith("sqlite")
+
+
+def make_engine(url: str, tuning: bool | None = None, **kwargs) -> Engine:
+    new_engine = create_engine(url, **{**_engine_options(url), **kwargs})
+    if _tuning_enabled(url, tuning):
+        install_sqlite_tuning(new_engine)
+    return new_engine
+
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def make_async_engine(url: str, tuning: bool | None = None, **kwargs) -> AsyncEngine:
+    new_engine = create_async_engine(to_async_url(url), **{**_engine_options(url), **kwargs})
+    if _tuning_enabled(url, tuning):
+        install_sqlite_tuning(new_engine.sync_engine)
+    return new_engine
+
+
+# Engines and session factories are built on first use rather than at import time, so
+# importing the app (a worker spawn, a test collection) does not touch the database.
+@lru_cache
+def get_engine() -> Engine:
+    return make_engine(settings.database_url)
+
+
+@lru_cache
+def get_sessionmaker() -> sessionmaker[Session]:
+    return sessionmaker(bind=get_engine(), autoflush=False, autocommit=False)
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    return make_async_engine(settings.database_url)
+
+
+@lru_cache
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+@lru_cache
+def get_read_async_sessionmaker() -> async_sessionmaker[AsyncSession] | None:
+    """Session factory for the read replica, or None when no replica is configured."""
+    if not settings.read_database_url:
+        return None
+    return async_sessionmaker(
+        bind=make_async_engine(settings.read_database_url),
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "SessionLocal": get_sessionmaker,
+    "async_engine": get_async_engine,
+    "AsyncSessionLocal": get_async_sessionmaker,
+}
+
+
+def __getattr__(name: str):
+    # Keeps ``from app.db import engine`` and friends working without eager construction.
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Base(DeclarativeBase):
     pass
 
 
+def create_schema(bind: Engine | None = None) -> None:
+    """Create missing tables (and the SQLite search index) and upgrade existing ones.
+
+    ``create_all`` skips tables that already exist, so columns and indexes added to a
+    model since its table was created are added separately. When the post counters are
+    new to the database they start from the posts already there. Safe to run repeatedly.
+    """
+    from app import models  # noqa: F401  # register tables with Base.metadata
+    from app.stats import reconcile_stats
+
+    with (bind or get_engine()).begin() as conn:
+        had_tables = set(inspect(conn).get_table_names())
+        Base.metadata.create_all(bind=conn)
+        added = _add_missing_columns(conn)
+        _create_missing_indexes(conn)
+        if "posts" in had_tables and "posts_fts" not in had_tables:
+            _create_search_index(conn)
+        new_counters = "feed_state" not in had_tables or any(
+            column in _COUNTER_COLUMNS for _, column in added
+        )
+        if "posts" in had_tables and new_counters:
+            reconcile_stats(conn)
+
+
+_COUNTER_COLUMNS = {"post_count", "last_post_at"}
+
+
+def _add_missing_columns(conn: Connection) -> set[tuple[str, str]]:
+    """ALTER TABLE ... ADD COLUMN for model columns an existing table lacks."""
+    inspector = inspect(conn)
+    added = set()
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                definition = CreateColumn(column).compile(dialect=conn.dialect)
+                conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {definition}")
+                added.add((table.name, column.name))
+    return added
+
+
+def _create_search_index(conn: Connection) -> None:
+    """Add the FTS5 index (which only comes with a new posts table) and index existing rows."""
+    from app.models import POSTS_FTS_DDL, fts5_available
+
+    if not fts5_available(conn):
+        return
+    for statement in POSTS_FTS_DDL:
+        conn.exec_driver_sql(statement)
+    conn.exec_driver_sql("INSERT INTO posts_fts(posts_fts) VALUES('rebuild')")
+
+
+def _create_missing_indexes(conn: Connection) -> None:
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+async def insert_returning(
+    db: AsyncSession, model: type[Base], rows: Sequence[dict[str, Any]]
+) -> list:
+    """Insert ``rows`` and return them as ``model`` objects, in the order given.
+
+    Backends that keep RETURNING rows in parameter order (SQLite, PostgreSQL) get one
+    multi-row INSERT ... RETURNING. Elsewhere, such as MySQL, the ORM inserts the rows
+    and reads back each new primary key.
+    """
+    if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        stmt = insert(model).returning(model, sort_by_parameter_order=True)
+        return list((await db.scalars(stmt, rows)).all())
+    objects = [model(**row) for row in rows]
+    db.add_all(objects)
+    await db.flush()
+    return objects
+
+
 def get_db() -> Iterator[Session]:
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+def wants_primary(request: Request) -> bool:
+    value = request.headers.get(READ_YOUR_WRITES_HEADER)
+    return value is not None and value.strip().lower() not in ("", "0", "false")
+
+
+async def get_read_db(
+    request: Request, primary: AsyncSession = Depends(get_async_db)
+) -> AsyncIterator[AsyncSession]:
+    """Session for read-only work: the replica when configured, otherwise the primary.
+
+    The primary session is opened lazily, so depending on it costs nothing when the
+    replica serves the request.
+    """
+    factory = get_read_async_sessionmaker()
+    if factory is None or wants_primary(request):
+        yield primary
+        return
+    async with factory() as db:
+        yield db
+
+
+def get_read_sessionmaker(request: Request) -> async_sessionmaker[AsyncSession]:
+    """Like get_read_db, but hands out the factory for sessions that outlive the handler.
+
+    Streaming responses are sent after the handler returns, when older FastAPI versions
+    have already closed yield dependencies, so they open their session while streaming.
+    """
+    factory = get_read_async_sessionmaker()
+    if factory is None or wants_primary(request):
+        return get_async_sessionmaker()
+    return factory
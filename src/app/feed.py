@@ -0,0 +1,58 @@
+import hashlib
+import math
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.cache import TTLCache
+from app.config import get_settings
+from app.metrics import CallbackMetric, registry
+
+settings = get_settings()
+
+# Serialized feed pages keyed by (feed version, page parameters). Entries never expire on
+# their own: a write bumps the version, so stale pages simply stop being looked up and
+# fall out of the LRU.
+feed_cache: TTLCache[bytes] = TTLCache(maxsize=settings.feed_cache_size)
+registry.register(
+    CallbackMetric(
+        "feed_cache_hits_total", "Feed page cache hits.", lambda: feed_cache.hits, "counter"
+    )
+)
+registry.register(
+    CallbackMetric(
+        "feed_cache_misses_total", "Feed page cache misses.", lambda: feed_cache.misses, "counter"
+    )
+)
+
+
+async def get_feed_version(db: AsyncSession) -> int:
+    version = await db.scalar(select(models.FeedState.version).where(models.FeedState.id == 1))
+    return version or 0
+
+
+async def bump_feed_version(db: AsyncSession) -> None:
+    """Invalidate cached feed pages; run inside the transaction that writes the posts."""
+    await db.execute(
+        update(models.FeedState)
+        .where(models.FeedState.id == 1)
+        .values(version=models.FeedState.version + 1)
+    )
+
+
+def make_etag(version: int, *page_key: object) -> str:
+    digest = hashlib.blake2b(repr(page_key).encode(), digest_size=8).hexdigest()
+    return f'"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match uses weak comparison, so a W/ prefix on the client's copy still matches.
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def cache_page(key: tuple, body: bytes) -> None:
+    feed_cache.set(key, body, expires_at=math.inf)
@@ -0,0 +1,56 @@
+import asyncio
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def make_hashing_executor(workers: int) -> ProcessPoolExecutor:
+    # Workers fork from a clean forkserver instead of a process that already runs the
+    # event loop and threadpool threads; the server imports the hashing code once.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["app.security"])
+    else:
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+class HashingBusyError(RuntimeError):
+    """Raised when the password hashing pool already has its maximum of pending jobs."""
+
+
+class PasswordHasher:
+    """Runs CPU-heavy password hashing in a bounded pool of worker processes.
+
+    At most ``workers + queue_size`` jobs may be in flight; further calls fail fast with
+    :class:`HashingBusyError` instead of queueing behind a login storm. The pool is
+    created lazily on first use so importing the app does not spawn processes.
+    """
+
+    def __init__(self, workers: int, queue_size: int) -> None:
+        self.workers = workers
+        self.max_pending = workers + queue_size
+        self.pending = 0
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = make_hashing_executor(self.workers)
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        if self.pending >= self.max_pending:
+            raise HashingBusyError("Password hashing queue is full")
+        self.pending += 1
+        try:
+            return await asyncio.wrap_future(self._get_executor().submit(func, *args))
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,129 @@
+"""Bulk user import for onboarding, used by ``infosec-api import-users``."""
+
+import csv
+import json
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import islice, repeat
+from pathlib import Path
+
+from pydantic import ValidationError
+from sqlalchemy import Engine
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import models, schemas
+from app.hashing import make_hashing_executor
+from app.security import get_password_hash
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING ... RETURNING.
+_CONFLICT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+@dataclass
+class RowFailure:
+    line: int
+    username: str | None
+    detail: str
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created: int = 0
+    seconds: float = 0.0
+    failures: list[RowFailure] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "failed": len(self.failures),
+            "seconds": round(self.seconds, 2),
+            "users_per_second": round(self.created / self.seconds, 1) if self.seconds else 0.0,
+        }
+
+
+def read_user_rows(path: Path, fmt: str | None = None) -> Iterator[tuple[int, dict]]:
+    """Yield ``(line number, row)`` from a CSV file with a header, or from JSON Lines."""
+    fmt = fmt or ("csv" if path.suffix.lower() == ".csv" else "jsonl")
+    with path.open(newline="", encoding="utf-8") as handle:
+        if fmt == "csv":
+            reader = csv.DictReader(handle)
+            for row in reader:
+                yield reader.line_num, row
+            return
+        for line_number, line in enumerate(handle, start=1):
+            if line.strip():
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as exc:
+                    yield line_number, {"_error": f"invalid JSON: {exc.msg}"}
+
+
+def _validate(
+    rows: Iterable[tuple[int, dict]], report: ImportReport
+) -> Iterator[tuple[int, schemas.UserCreate]]:
+    for line, row in rows:
+        report.rows += 1
+        if not isinstance(row, dict):
+            report.failures.append(RowFailure(line, None, "expected an object"))
+            continue
+        if "_error" in row:
+            report.failures.append(RowFailure(line, None, row["_error"]))
+            continue
+        try:
+            yield line, schemas.UserCreate.model_validate(row)
+        except ValidationError as exc:
+            detail = "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors())
+            report.failures.append(RowFailure(line, row.get("username"), detail))
+
+
+def import_users(
+    engine: Engine,
+    rows: Iterable[tuple[int, dict]],
+    rounds: int,
+    workers: int,
+    batch_size: int = 1000,
+) -> ImportReport:
+    """Hash passwords across a process pool and insert users in batches.
+
+    Existing usernames are left to the unique constraint (ON CONFLICT DO NOTHING) rather
+    than checked up front; rows it skipped are reported as conflicts.
+    """
+    conflict_insert = _CONFLICT_INSERTS.get(engine.dialect.name)
+    if conflict_insert is None:
+        raise ValueError(f"Bulk import does not support the {engine.dialect.name} dialect")
+
+    report = ImportReport()
+    started = time.perf_counter()
+    valid = _validate(rows, report)
+    with make_hashing_executor(workers) as executor:
+        while batch := list(islice(valid, batch_size)):
+            hashes = executor.map(
+                get_password_hash,
+                (user.password for _, user in batch),
+                repeat(rounds),
+                chunksize=max(1, len(batch) // (workers * 4)),
+            )
+            values = [
+                {"username": user.username, "password_hash": password_hash}
+                for (_, user), password_hash in zip(batch, hashes, strict=True)
+            ]
+            stmt = (
+                conflict_insert(models.User)
+                .on_conflict_do_nothing(index_elements=[models.User.username])
+                .returning(models.User.username)
+            )
+            with engine.begin() as conn:
+                inserted = set(conn.scalars(stmt, values).all())
+            report.created += len(inserted)
+            for line, user in batch:
+                if user.username in inserted:
+                    inserted.discard(user.username)  # a repeat later in the batch conflicts
+                else:
+                    report.failures.append(
+                        RowFailure(line, user.username, "Username already exists")
+                    )
+    report.seconds = time.perf_counter() - started
+    return report
@@ -1,12 +1,50 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
 
-from app import models  # noqa: F401  # ensure models register with Base metadata
-from app.db import Base, engine
-from app.routers import auth, posts
+from fastapi import FastAPI, Response
+from starlette.concurrency import run_in_threadpool
 
-Base.metadata.create_all(bind=engine)
+from app import metrics
+from app.config import get_settings
+from app.db import create_schema
+from app.profiling import ProfilingMiddleware
+from app.routers import auth, posts, stats, users
+from app.security import get_bcrypt_rounds, password_hasher
+from app.sharding import create_shard_schemas
 
-app = FastAPI(title="Infosec Lab API")
+settings = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    if settings.create_schema_on_startup:
+        await run_in_threadpool(create_schema)
+        await run_in_threadpool(create_shard_schemas)
+    # Calibrate the bcrypt cost now rather than on the first registration.
+    await run_in_threadpool(get_bcrypt_rounds)
+    yield
+    password_hasher.shutdown()
+
+
+app = FastAPI(title="Infosec Lab API", lifespan=lifespan)
 
 app.include_router(auth.router)
 app.include_router(posts.router)
+app.include_router(users.router)
+app.include_router(stats.router)
+
+# Added before the metrics middleware so it runs inside it and shares its SQL counter.
+if settings.profiling_enabled:
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=settings.profiling_dir,
+        sample_rate=settings.profiling_sample_rate,
+        header=settings.profiling_header,
+        token=settings.profiling_token,
+    )
+
+if settings.metrics_enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def read_metrics() -> Response:
+        return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,277 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+No client library or collector is needed: counters and histograms live in this module
+and ``/metrics`` renders them on demand.
+"""
+
+import bisect
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}"
+
+
+@dataclass
+class _HistogramSeries:
+    buckets: list[int]
+    total: float = 0.0
+    count: int = 0
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.upper_bounds = tuple(buckets)
+        self._series: dict[tuple[str, ...], _HistogramSeries] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.upper_bounds, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries([0] * len(self.upper_bounds))
+            if index < len(series.buckets):
+                series.buckets[index] += 1
+            series.total += value
+            series.count += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(tuple(str(labels[name]) for name in self.labelnames))
+        return series.count if series else 0
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for key, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, hits in zip(self.upper_bounds, series.buckets, strict=True):
+                cumulative += hits
+                labels = _format_labels(self.labelnames, key, f'le="{_format_number(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            yield f"{self.name}_bucket{labels} {series.count}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_number(series.total)}"
+            yield f"{self.name}_count{labels} {series.count}"
+
+
+class CallbackMetric:
+    """A single value read from a callback at scrape time, e.g. a cache's own counters."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], float],
+        metric_type: str = "gauge",
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.metric_type = metric_type
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.metric_type}"
+        yield f"{self.name} {_format_number(self.callback())}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram | CallbackMetric] = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(
+    Counter("http_requests_total", "HTTP requests handled.", ("method", "route", "status"))
+)
+http_request_duration = registry.register(
+    Histogram("http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+)
+http_request_db_queries = registry.register(
+    Histogram(
+        "http_request_db_queries",
+        "SQL statements executed per HTTP request.",
+        ("method", "route"),
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+)
+http_request_db_duration = registry.register(
+    Histogram(
+        "http_request_db_duration_seconds",
+        "Time spent executing SQL per HTTP request.",
+        ("method", "route"),
+    )
+)
+db_queries = registry.register(Counter("db_queries_total", "SQL statements executed."))
+post_write_batch_size = registry.register(
+    Histogram(
+        "post_write_batch_size",
+        "Posts committed per coalesced write transaction.",
+        buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+    )
+)
+password_hashing_duration = registry.register(
+    Histogram(
+        "password_hashing_duration_seconds",
+        "Wall time of bcrypt hash and verify calls, including pool queueing.",
+        ("operation",),
+    )
+)
+auth_attempts = registry.register(
+    Counter(
+        "auth_attempts_total",
+        "Login and registration attempts admitted or rejected by the rate limiter.",
+        ("endpoint", "outcome"),
+    )
+)
+token_decode_duration = registry.register(
+    Histogram("token_decode_duration_seconds", "Time spent decoding and verifying JWTs.")
+)
+sanitize_duration = registry.register(
+    Histogram("sanitize_duration_seconds", "Time spent in the HTML sanitizer.", ("site",))
+)
+
+
+@dataclass
+class RequestStats:
+    db_queries: int = 0
+    db_seconds: float = 0.0
+
+
+# Set per HTTP request by the middleware; SQL events executed on its behalf add to it.
+current_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+# Listening on the Engine class covers every engine, including the sync side of async ones.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context.app_query_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    db_queries.inc()
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += time.perf_counter() - context.app_query_started_at
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency and SQL usage."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        # Share the counter with an outer middleware (e.g. the profiler) if one set it.
+        stats = current_request_stats.get()
+        token = None
+        if stats is None:
+            stats = RequestStats()
+            token = current_request_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            if token is not None:
+                current_request_stats.reset(token)
+            route = scope.get("route")
+            # Label by route template, never by raw path, to keep cardinality bounded.
+            labels = {"method": scope["method"], "route": getattr(route, "path", "<unmatched>")}
+            http_requests.inc(status=str(status_code), **labels)
+            http_request_duration.observe(elapsed, **labels)
+            http_request_db_queries.observe(stats.db_queries, **labels)
+            http_request_db_duration.observe(stats.db_seconds, **labels)
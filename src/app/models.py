@@ -1,6 +1,17 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    DDL,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 from app.db import Base
@@ -13,17 +24,86 @@ class User(Base):
     username = Column(String(100), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Denormalized from posts in the writing transaction; `infosec-api reconcile-stats`
+    # rebuilds them.
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_post_at = Column(DateTime(timezone=True), nullable=True)
 
     posts = relationship("Post", back_populates="owner")
 
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_owner_created_id", "owner_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Version of the sanitizer policy applied on write; NULL for rows that predate it.
+    sanitizer_version = Column(Integer, nullable=True)
 
     owner = relationship("User", back_populates="posts")
+
+
+def fts5_available(bind) -> bool:
+    if bind.dialect.name != "sqlite":
+        return False
+    options = {row[0] for row in bind.exec_driver_sql("PRAGMA compile_options")}
+    return "ENABLE_FTS5" in options
+
+
+def _fts5_available(ddl, target, bind, **kw) -> bool:
+    return fts5_available(bind)
+
+
+# External-content FTS5 index over posts, kept in sync by triggers so every write path
+# (single insert, bulk insert, raw SQL) updates it in the same transaction.
+POSTS_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+    "title, content, content='posts', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN "
+    "INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content); "
+    "END",
+]
+
+for _statement in POSTS_FTS_DDL:
+    event.listen(
+        Post.__table__, "after_create", DDL(_statement).execute_if(callable_=_fts5_available)
+    )
+event.listen(
+    Post.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS posts_fts").execute_if(dialect="sqlite"),
+)
+
+
+class FeedState(Base):
+    """Single-row table holding the feed version that every post write bumps, plus totals."""
+
+    __tablename__ = "feed_state"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_post_at = Column(DateTime(timezone=True), nullable=True)
+
+
+event.listen(
+    FeedState.__table__,
+    "after_create",
+    DDL("INSERT INTO feed_state (id, version) VALUES (1, 0)"),
+)
@@ -0,0 +1,78 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Largest value an SQLite INTEGER holds; larger ids in a cursor cannot be bound at all.
+MAX_ROW_ID = 2**63 - 1
+
+
+def _encode(payload: object) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _decode(cursor: str) -> object:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def encode_cursor(created_at: datetime, post_id: int) -> str:
+    """Encode a ``(created_at, id)`` keyset position as an opaque URL-safe token."""
+    return _encode([created_at.isoformat(), post_id])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, post_id = _decode(cursor)
+        if not isinstance(post_id, int) or not 0 <= post_id <= MAX_ROW_ID:
+            raise ValueError("Invalid cursor id")
+        return datetime.fromisoformat(created_at), post_id
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise _invalid_cursor() from exc
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Encode a row offset for result sets without a stable keyset, such as ranked search."""
+    return _encode({"offset": offset})
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    try:
+        offset = _decode(cursor)["offset"]
+        # Leave room for the page (and its lookahead row) added to the offset.
+        if not isinstance(offset, int) or not 0 <= offset <= MAX_ROW_ID - MAX_PAGE_SIZE - 1:
+            raise ValueError("Invalid cursor offset")
+        return offset
+    except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+        raise _invalid_cursor() from exc
+
+
+def keyset_statement(stmt: Select, model, cursor: str | None, limit: int) -> Select:
+    """Restrict ``stmt`` to one newest-first page after ``cursor``, plus one lookahead row.
+
+    Rows are ordered by ``(created_at, id)`` descending and resumed with a row-value
+    comparison, so every page is an index range scan regardless of its depth.
+    """
+    if cursor is not None:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(model.created_at, model.id) < (created_at, row_id))
+    return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def split_page(rows: Sequence, limit: int) -> tuple[list, str | None]:
+    """Drop the lookahead row fetched by :func:`keyset_statement` and derive the next cursor."""
+    if len(rows) <= limit:
+        return list(rows), None
+    rows = list(rows[:limit])
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
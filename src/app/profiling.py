@@ -0,0 +1,148 @@
+"""Opt-in per-request profiling for staging.
+
+Requests that carry the profiling header (or fall in the sample) run under cProfile while
+a background thread samples the event loop thread's stack. Each one leaves three files in
+the profile directory: ``.pstats`` (load with ``pstats`` or snakeviz), ``.collapsed``
+(one ``frame;frame;... count`` line per stack, for flamegraph.pl or speedscope) and
+``.json`` with the route, status, wall time and SQL statement count.
+
+Both profilers only see the event loop thread: bcrypt time shows up as waiting on the
+hashing pool and SQLite time as waiting on the aiosqlite thread. Other requests handled
+concurrently on the loop are sampled too. The middleware is only installed when
+``profiling_enabled`` is set, so it costs nothing otherwise.
+"""
+
+import cProfile
+import hmac
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import RequestStats, current_request_stats
+
+
+class StackSampler:
+    """Counts the stacks of one thread, sampled every ``interval`` seconds."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stopped.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware writing a profile for flagged or sampled requests."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        directory: str | Path,
+        sample_rate: float = 0.0,
+        header: str = "X-Profile",
+        token: str | None = None,
+        interval: float = 0.001,
+    ) -> None:
+        self.app = app
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.header = header.lower()
+        self.token = token
+        self.interval = interval
+        # cProfile can only profile one request per thread at a time.
+        self._busy = False
+
+    def _wanted(self, scope: Scope) -> bool:
+        value = Headers(scope=scope).get(self.header)
+        if value is not None:
+            return self.token is None or hmac.compare_digest(value.encode(), self.token.encode())
+        return random.random() < self.sample_rate  # noqa: S311 - sampling, not security
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._busy or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # Share the per-request SQL counter with the metrics middleware when it is outside.
+        stats = current_request_stats.get()
+        token = None
+        if stats is None:
+            stats = RequestStats()
+            token = current_request_stats.set(stats)
+
+        self._busy = True
+        profiler = cProfile.Profile()
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        sampler.start()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - started
+            stacks = sampler.stop()
+            self._busy = False
+            if token is not None:
+                current_request_stats.reset(token)
+
+        route = getattr(scope.get("route"), "path", "<unmatched>")
+        summary = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": route,
+            "status": status_code,
+            "wall_seconds": round(elapsed, 6),
+            "db_queries": stats.db_queries,
+            "db_seconds": round(stats.db_seconds, 6),
+            "samples": sum(stacks.values()),
+        }
+        await run_in_threadpool(self._write, summary, profiler, stacks)
+
+    def _write(self, summary: dict, profiler: cProfile.Profile, stacks: Counter[str]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", summary["route"]).strip("_") or "root"
+        stem = f"{time.strftime('%Y%m%dT%H%M%S')}-{time.time_ns() % 10**9:09d}-"
+        base = self.directory / f"{stem}{summary['method']}-{slug}"
+        profiler.dump_stats(base.with_suffix(".pstats"))
+        base.with_suffix(".collapsed").write_text(
+            "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        )
+        base.with_suffix(".json").write_text(json.dumps(summary, indent=2))
@@ -0,0 +1,111 @@
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+from fastapi import HTTPException, Request, status
+
+from app.config import get_settings
+from app.metrics import CallbackMetric, auth_attempts, registry
+
+settings = get_settings()
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets holding at most ``maxsize`` keys.
+
+    Each key refills at ``rate`` tokens per second up to ``burst``. Buckets live in an
+    LRU-ordered dict of ``(tokens, updated_at)`` tuples; when the store is full the key
+    idle the longest is evicted, which costs it nothing once its bucket has refilled.
+    Not thread-safe; it is meant to be used from the event loop thread only.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        maxsize: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.maxsize = maxsize
+        self.evictions = 0
+        self._clock = clock
+        self._buckets: OrderedDict[Hashable, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, key: Hashable) -> float:
+        """Take one token for ``key``; return 0 if admitted, else seconds until one is free."""
+        now = self._clock()
+        entry = self._buckets.get(key)
+        if entry is None:
+            tokens = float(self.burst)
+        else:
+            tokens = min(self.burst, entry[0] + (now - entry[1]) * self.rate)
+
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / self.rate if self.rate > 0 else math.inf
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+            self.evictions += 1
+        return wait
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self.evictions = 0
+
+
+ip_limiter = TokenBucketLimiter(
+    rate=settings.auth_ip_rate_per_minute / 60,
+    burst=settings.auth_ip_burst,
+    maxsize=settings.auth_rate_limit_max_keys,
+)
+username_limiter = TokenBucketLimiter(
+    rate=settings.auth_username_rate_per_minute / 60,
+    burst=settings.auth_username_burst,
+    maxsize=settings.auth_rate_limit_max_keys,
+)
+
+registry.register(
+    CallbackMetric(
+        "auth_rate_limit_keys",
+        "Client IPs and usernames tracked by the auth rate limiter.",
+        lambda: len(ip_limiter) + len(username_limiter),
+    )
+)
+
+
+def username_key(username: str) -> bytes:
+    """Fixed-size bucket key, so the store is bounded in bytes as well as in keys."""
+    return hashlib.blake2b(username.casefold().encode(), digest_size=16).digest()
+
+
+def check_auth_rate_limit(request: Request, endpoint: str, username: str) -> None:
+    """Admit or reject an auth attempt before any database lookup or password hashing.
+
+    Keyed by the socket peer address, not by forwarding headers a client could forge.
+    """
+    if not settings.auth_rate_limit_enabled:
+        return
+    client_ip = request.client.host if request.client else "unknown"
+    wait = ip_limiter.acquire(client_ip) or username_limiter.acquire(username_key(username))
+    if not wait:
+        auth_attempts.inc(endpoint=endpoint, outcome="admitted")
+        return
+
+    auth_attempts.inc(endpoint=endpoint, outcome="rejected")
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many attempts, retry later",
+        headers={"Retry-After": str(max(1, math.ceil(wait)))},
+    )
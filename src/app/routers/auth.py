@@ -1,33 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models, schemas
-from app.db import get_db
-from app.security import create_access_token, get_password_hash, verify_password
+from app.db import get_async_db, get_async_sessionmaker
+from app.ratelimit import check_auth_rate_limit
+from app.security import (
+    create_access_token,
+    get_password_hash_async,
+    password_needs_rehash,
+    verify_password_async,
+)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+async def _rehash_password(user_id: int, old_hash: str, password: str) -> None:
+    """Upgrade a hash whose cost is out of policy, after the login response is sent."""
+    try:
+        new_hash = await get_password_hash_async(password)
+    except HTTPException:
+        return  # hashing pool is saturated; the next login retries
+    # The request's session is closed by now, so the task opens its own.
+    async with get_async_sessionmaker()() as db:
+        # Matching on the old hash skips the update if the password changed meanwhile.
+        await db.execute(
+            update(models.User)
+            .where(models.User.id == user_id, models.User.password_hash == old_hash)
+            .values(password_hash=new_hash)
+        )
+        await db.commit()
+
+
 @router.post("/register", response_model=schemas.UserOut, status_code=status.HTTP_201_CREATED)
-def register_user(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
-    existing_user = db.query(models.User).filter(models.User.username == user_in.username).first()
+async def register_user(
+    user_in: schemas.UserCreate, request: Request, db: AsyncSession = Depends(get_async_db)
+):
+    check_auth_rate_limit(request, "register", user_in.username)
+    existing_user = await db.scalar(
+        select(models.User).where(models.User.username == user_in.username)
+    )
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Username already exists"
         )
 
-    user = models.User(username=user_in.username, password_hash=get_password_hash(user_in.password))
+    password_hash = await get_password_hash_async(user_in.password)
+    user = models.User(username=user_in.username, password_hash=password_hash)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
 @router.post("/login", response_model=schemas.Token)
-def login(user_in: schemas.LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.username == user_in.username).first()
-    if user is None or not verify_password(user_in.password, user.password_hash):
+async def login(
+    user_in: schemas.LoginRequest,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+):
+    check_auth_rate_limit(request, "login", user_in.username)
+    user = await db.scalar(select(models.User).where(models.User.username == user_in.username))
+    if user is None or not await verify_password_async(user_in.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+    if password_needs_rehash(user.password_hash):
+        background_tasks.add_task(_rehash_password, user.id, user.password_hash, user_in.password)
+
     token = create_access_token(subject=user.username)
     return schemas.Token(access_token=token)
@@ -1,46 +1,282 @@
-import bleach
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from collections.abc import AsyncIterator, Sequence
+from datetime import UTC, datetime
+from typing import Any
 
-from app import models, schemas
-from app.db import get_db
-from app.security import get_current_user
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import Row, Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import models, sanitizer, schemas
+from app.coalescer import PostWriteCoalescer, ShardedPostWriteCoalescer, get_post_coalescer
+from app.config import get_settings
+from app.db import get_async_db, get_read_db, get_read_sessionmaker, insert_returning
+from app.feed import (
+    bump_feed_version,
+    cache_page,
+    etag_matches,
+    feed_cache,
+    get_feed_version,
+    make_etag,
+)
+from app.metrics import sanitize_duration
+from app.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    MAX_ROW_ID,
+    decode_offset_cursor,
+    encode_offset_cursor,
+    keyset_statement,
+    split_page,
+)
+from app.search import search_posts, search_sharded_posts
+from app.security import Principal, get_current_user
+from app.serialization import (
+    PostView,
+    encode_post_lines,
+    encode_post_page,
+    get_post_view,
+    select_post_rows,
+)
+from app.sharding import PostShards, get_post_shards, write_posts
+from app.stats import record_new_posts
 
 router = APIRouter(prefix="/api/posts", tags=["posts"])
+settings = get_settings()
+
+
+def _sanitize_posts(posts: list[schemas.PostCreate]) -> list[tuple[str, str]]:
+    with sanitize_duration.time(site="create_post"):
+        cleaned = sanitizer.clean_many(
+            text for post in posts for text in (post.title, post.content)
+        )
+    return list(zip(cleaned[0::2], cleaned[1::2], strict=True))
+
+
+def _check_sanitized(title: str, content: str) -> None:
+    if not title.strip():
+        raise ValueError("Title removed by sanitizer")
+    if not content.strip():
+        raise ValueError("Content removed by sanitizer")
+
+
+def _describe_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'body'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
 
+async def _stream_partitions(
+    session_factory: async_sessionmaker[AsyncSession], stmt: Select, chunk_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    # The session belongs to the response body, not to the request's dependencies.
+    async with session_factory() as db:
+        result = await db.stream(stmt.execution_options(yield_per=chunk_size))
+        try:
+            async for rows in result.partitions():
+                yield rows
+        finally:
+            await result.close()
 
-@router.get("", response_model=list[schemas.PostOut])
+
+@router.get("", response_model=schemas.SparsePostPage)
 async def list_posts(
-    db: Session = Depends(get_db),
-    _: models.User = Depends(get_current_user),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    if_none_match: str | None = Header(default=None),
+    view: PostView = Depends(get_post_view),
+    db: AsyncSession = Depends(get_read_db),
+    shards: PostShards | None = Depends(get_post_shards),
+    _: Principal = Depends(get_current_user),
+):
+    version = await (get_feed_version(db) if shards is None else shards.feed_version())
+    etag = make_etag(version, cursor, limit, view.cache_key)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cache_key = (version, cursor, limit, view.cache_key)
+    body = feed_cache.get(cache_key)
+    if body is None:
+        stmt = keyset_statement(select_post_rows(view), models.Post, cursor, limit)
+        if shards is None:
+            rows = (await db.execute(stmt)).all()
+        else:
+            # Every shard returns its own newest limit + 1 rows; merging them gives the page.
+            rows = await shards.newest_first(stmt, limit + 1)
+        rows, next_cursor = split_page(rows, limit)
+        body = encode_post_page(rows, next_cursor, view)
+        cache_page(cache_key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_posts(
+    since: datetime | None = Query(None, description="only posts created after this time"),
+    after_id: int | None = Query(
+        None, ge=0, le=MAX_ROW_ID, description="with since: resume after this post id"
+    ),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_read_sessionmaker),
+    shards: PostShards | None = Depends(get_post_shards),
+    _: Principal = Depends(get_current_user),
 ):
-    return db.query(models.Post).order_by(models.Post.created_at.desc()).all()
+    """Stream every post, oldest first, as newline-delimited JSON.
+
+    Rows are fetched ``export_chunk_size`` at a time from a streaming cursor, so memory
+    stays flat however large the table is. Pass the last line's ``created_at`` as
+    ``since`` and its ``id`` as ``after_id`` to resume an export; posts sharing that
+    timestamp but with a larger id are still included.
+    """
+    stmt = select_post_rows().order_by(models.Post.created_at, models.Post.id)
+    if since is not None:
+        if since.tzinfo is not None:
+            # Stored timestamps are naive UTC (datetime.utcnow).
+            since = since.astimezone(UTC).replace(tzinfo=None)
+        if after_id is None:
+            stmt = stmt.where(models.Post.created_at > since)
+        else:
+            stmt = stmt.where(tuple_(models.Post.created_at, models.Post.id) > (since, after_id))
+    if shards is not None:
+        partitions = shards.stream_oldest_first(stmt, settings.export_chunk_size)
+    else:
+        partitions = _stream_partitions(session_factory, stmt, settings.export_chunk_size)
+
+    async def lines() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in encode_post_lines(partitions):
+                yield chunk
+        finally:
+            await partitions.aclose()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/search", response_model=schemas.PostPage)
+async def search(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+    shards: PostShards | None = Depends(get_post_shards),
+    _: Principal = Depends(get_current_user),
+):
+    terms = q.split()
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Empty search query"
+        )
+    offset = decode_offset_cursor(cursor) if cursor is not None else 0
+    if shards is None:
+        posts = await search_posts(db, terms, limit + 1, offset)
+    else:
+        posts = await search_sharded_posts(shards, terms, limit + 1, offset)
+    next_cursor = encode_offset_cursor(offset + limit) if len(posts) > limit else None
+    return schemas.PostPage(items=posts[:limit], next_cursor=next_cursor)
 
 
 @router.post("", response_model=schemas.PostOut, status_code=status.HTTP_201_CREATED)
 async def create_post(
     post_in: schemas.PostCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
+    coalescer: PostWriteCoalescer | ShardedPostWriteCoalescer | None = Depends(get_post_coalescer),
+    shards: PostShards | None = Depends(get_post_shards),
 ):
-    sanitized_title = bleach.clean(post_in.title, strip=True)
-    sanitized_content = bleach.clean(post_in.content, strip=True)
+    [(sanitized_title, sanitized_content)] = _sanitize_posts([post_in])
+    try:
+        _check_sanitized(sanitized_title, sanitized_content)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        ) from exc
+
+    values = {
+        "title": sanitized_title,
+        "content": sanitized_content,
+        "owner_id": current_user.id,
+        "sanitizer_version": schemas.SANITIZER_VERSION,
+    }
+    if coalescer is not None:
+        post_id, created_at = await coalescer.submit(values)
+        return {**values, "id": post_id, "created_at": created_at}
+
+    if shards is not None:
+        async with shards.session_for(current_user.id) as shard_db:
+            [post] = await write_posts(shard_db, shards.index_for(current_user.id), [values])
+            await shard_db.commit()
+        return post
+
+    post = models.Post(**values)
+    db.add(post)
+    await db.flush()
+    await record_new_posts(db, [(post.owner_id, post.created_at)])
+    await bump_feed_version(db)
+    await db.commit()
+    await db.refresh(post)
+    return post
+
 
-    if not sanitized_title.strip():
+@router.post("/batch", response_model=schemas.PostBatchResult, status_code=status.HTTP_201_CREATED)
+async def create_posts_batch(
+    # Items are validated one by one below, so a bad element is reported, not fatal.
+    items: list[Any] = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user),
+    shards: PostShards | None = Depends(get_post_shards),
+):
+    """Create many posts in one transaction; invalid items are reported, not fatal."""
+    if len(items) > settings.post_batch_max_items:
         raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Title removed by sanitizer"
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch exceeds {settings.post_batch_max_items} items",
         )
-    if not sanitized_content.strip():
+
+    valid: list[tuple[int, schemas.PostCreate]] = []
+    errors: list[schemas.PostBatchError] = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schemas.PostCreate.model_validate(item)))
+        except ValidationError as exc:
+            errors.append(
+                schemas.PostBatchError(index=index, detail=_describe_validation_error(exc))
+            )
+
+    rows: list[dict[str, Any]] = []
+    cleaned = _sanitize_posts([post_in for _, post_in in valid])
+    for (index, _), (title, content) in zip(valid, cleaned, strict=True):
+        try:
+            _check_sanitized(title, content)
+        except ValueError as exc:
+            errors.append(schemas.PostBatchError(index=index, detail=str(exc)))
+            continue
+        rows.append(
+            {
+                "title": title,
+                "content": content,
+                "owner_id": current_user.id,
+                "sanitizer_version": schemas.SANITIZER_VERSION,
+            }
+        )
+    errors.sort(key=lambda error: error.index)
+
+    if not rows:
         raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Content removed by sanitizer"
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors] or "Batch is empty",
         )
 
-    post = models.Post(
-        title=sanitized_title,
-        content=sanitized_content,
-        owner_id=current_user.id,
-    )
-    db.add(post)
-    db.commit()
-    db.refresh(post)
-    return post
+    if shards is not None:
+        # All posts of one owner live on the same shard, so this is still one transaction.
+        async with shards.session_for(current_user.id) as shard_db:
+            posts = await write_posts(shard_db, shards.index_for(current_user.id), rows)
+            await shard_db.commit()
+        return schemas.PostBatchResult(items=posts, errors=errors)
+
+    # One multi-row INSERT ... RETURNING instead of an INSERT plus refresh per post.
+    posts = await insert_returning(db, models.Post, rows)
+    await record_new_posts(db, [(post.owner_id, post.created_at) for post in posts])
+    await bump_feed_version(db)
+    await db.commit()
+    return schemas.PostBatchResult(items=posts, errors=errors)
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+from app.db import get_read_db
+from app.security import Principal, get_current_user
+from app.sharding import PostShards, get_post_shards
+
+router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+
+async def _feed_totals(db: AsyncSession) -> tuple[int, datetime | None]:
+    row = (
+        await db.execute(
+            select(models.FeedState.post_count, models.FeedState.last_post_at).where(
+                models.FeedState.id == 1
+            )
+        )
+    ).one_or_none()
+    return (0, None) if row is None else (row.post_count, row.last_post_at)
+
+
+@router.get("", response_model=schemas.FeedStats)
+async def feed_stats(
+    db: AsyncSession = Depends(get_read_db),
+    shards: PostShards | None = Depends(get_post_shards),
+    _: Principal = Depends(get_current_user),
+):
+    """Feed totals read from the feed_state row (one per shard), not by counting posts."""
+    if shards is None:
+        total, last_post_at = await _feed_totals(db)
+        return schemas.FeedStats(total_posts=total, last_post_at=last_post_at)
+    totals = await shards.fan_out(_feed_totals)
+    latest = [last_post_at for _, last_post_at in totals if last_post_at is not None]
+    return schemas.FeedStats(
+        total_posts=sum(total for total, _ in totals), last_post_at=max(latest, default=None)
+    )
@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+from app.db import get_read_db
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_statement, split_page
+from app.security import Principal, get_current_user
+from app.serialization import PostView, encode_post_page, get_post_view, select_post_rows
+from app.sharding import PostShards, get_post_shards
+
+router = APIRouter(prefix="/api/users", tags=["users"])
+
+
+async def _owner_timeline(
+    db: AsyncSession,
+    shards: PostShards | None,
+    owner_id: int,
+    cursor: str | None,
+    limit: int,
+    view: PostView,
+) -> Response:
+    stmt = select_post_rows(view).where(models.Post.owner_id == owner_id)
+    stmt = keyset_statement(stmt, models.Post, cursor, limit)
+    if shards is None:
+        rows = (await db.execute(stmt)).all()
+    else:
+        # An owner's posts all live on one shard.
+        async with shards.session_for(owner_id) as shard_db:
+            rows = (await shard_db.execute(stmt)).all()
+    rows, next_cursor = split_page(rows, limit)
+    return Response(
+        content=encode_post_page(rows, next_cursor, view), media_type="application/json"
+    )
+
+
+@router.get("/me/posts", response_model=schemas.SparsePostPage)
+async def list_my_posts(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    view: PostView = Depends(get_post_view),
+    db: AsyncSession = Depends(get_read_db),
+    shards: PostShards | None = Depends(get_post_shards),
+    current_user: Principal = Depends(get_current_user),
+):
+    return await _owner_timeline(db, shards, current_user.id, cursor, limit, view)
+
+
+@router.get("/{user_id}/posts", response_model=schemas.SparsePostPage)
+async def list_user_posts(
+    user_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    view: PostView = Depends(get_post_view),
+    db: AsyncSession = Depends(get_read_db),
+    shards: PostShards | None = Depends(get_post_shards),
+    _: Principal = Depends(get_current_user),
+):
+    if await db.get(models.User, user_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return await _owner_timeline(db, shards, user_id, cursor, limit, view)
+
+
+@router.get("/{user_id}/stats", response_model=schemas.UserStats)
+async def user_stats(
+    user_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    shards: PostShards | None = Depends(get_post_shards),
+    _: Principal = Depends(get_current_user),
+):
+    user = await db.get(models.User, user_id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    if shards is not None:
+        # Shards keep no per-user counters; this is an index-only count on one shard.
+        async with shards.session_for(user_id) as shard_db:
+            row = (
+                await shard_db.execute(
+                    select(func.count(), func.max(models.Post.created_at)).where(
+                        models.Post.owner_id == user_id
+                    )
+                )
+            ).one()
+        return schemas.UserStats(user_id=user.id, post_count=row[0], last_post_at=row[1])
+    return schemas.UserStats(
+        user_id=user.id, post_count=user.post_count, last_post_at=user.last_post_at
+    )
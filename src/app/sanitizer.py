@@ -0,0 +1,50 @@
+"""The HTML sanitizer policy, shared by every place that cleans user text.
+
+:func:`clean` returns exactly what ``bleach.clean(value, strip=True)`` would, but reuses
+one preconfigured ``Cleaner`` per thread instead of building a new one on every call,
+and returns text untouched without parsing it when it cannot change.
+"""
+
+import re
+import threading
+from collections.abc import Iterable
+
+# bleach only ever changes text that contains markup or entity starts ("<", "&"), ">"
+# (escaped on output) or control characters other than tab and newline (replaced, and
+# "\r" normalized). Anything else comes back unchanged, so it skips the html5lib parse.
+# tests/test_sanitizer.py checks this against bleach for every code point it can.
+_NEEDS_CLEANING = re.compile(r"[\x00-\x08\x0b-\x1f&<>]")
+
+_local = threading.local()
+
+
+def _get_cleaner():
+    # A Cleaner holds parser and serializer state and is not thread-safe.
+    cleaner = getattr(_local, "cleaner", None)
+    if cleaner is None:
+        from bleach.sanitizer import Cleaner  # deferred: html5lib is slow to import
+
+        cleaner = _local.cleaner = Cleaner(strip=True)
+    return cleaner
+
+
+def needs_cleaning(value: str) -> bool:
+    return _NEEDS_CLEANING.search(value) is not None
+
+
+def clean(value: str) -> str:
+    if not needs_cleaning(value):
+        return value
+    return _get_cleaner().clean(value)
+
+
+def clean_many(values: Iterable[str]) -> list[str]:
+    """Clean many strings with one cleaner lookup; the result keeps the input order."""
+    cleaner = None
+    cleaned = []
+    for value in values:
+        if needs_cleaning(value):
+            cleaner = cleaner or _get_cleaner()
+            value = cleaner.clean(value)
+        cleaned.append(value)
+    return cleaned
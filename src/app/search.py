@@ -0,0 +1,92 @@
+import heapq
+import itertools
+
+from sqlalchemy import Select, and_, column, literal_column, or_, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.sharding import PostShards
+
+posts_fts = table("posts_fts", column("rowid"))
+# Title matches weigh more than body matches; lower bm25 scores rank first.
+bm25_rank = literal_column("bm25(posts_fts, 2.0, 1.0)")
+
+
+def to_fts_query(terms: list[str]) -> str:
+    """Quote every term so user input is matched literally, never parsed as FTS5 syntax."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+async def fts_available(db: AsyncSession) -> bool:
+    if db.get_bind().dialect.name != "sqlite":
+        return False
+    found = await db.scalar(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_fts'")
+    )
+    return found is not None
+
+
+def _fts_statement(terms: list[str]) -> Select:
+    return (
+        select(models.Post)
+        .join(posts_fts, posts_fts.c.rowid == models.Post.id)
+        .where(text("posts_fts MATCH :match").bindparams(match=to_fts_query(terms)))
+        .order_by(bm25_rank, models.Post.id.desc())
+    )
+
+
+def _substring_statement(terms: list[str]) -> Select:
+    # Without FTS5 fall back to substring matching, newest first.
+    return (
+        select(models.Post)
+        .where(
+            and_(
+                *(
+                    or_(
+                        models.Post.title.ilike(_like_pattern(term), escape="\\"),
+                        models.Post.content.ilike(_like_pattern(term), escape="\\"),
+                    )
+                    for term in terms
+                )
+            )
+        )
+        .order_by(models.Post.created_at.desc(), models.Post.id.desc())
+    )
+
+
+async def search_posts(
+    db: AsyncSession, terms: list[str], limit: int, offset: int
+) -> list[models.Post]:
+    """Return up to ``limit`` posts matching every term, best match first."""
+    if await fts_available(db):
+        stmt = _fts_statement(terms)
+    else:
+        stmt = _substring_statement(terms)
+    return list((await db.scalars(stmt.limit(limit).offset(offset))).all())
+
+
+async def _ranked_matches(db: AsyncSession, terms: list[str], limit: int) -> list[tuple]:
+    """Up to ``limit`` ``(sort key, post)`` pairs, in the order search_posts returns them."""
+    if await fts_available(db):
+        rows = await db.execute(_fts_statement(terms).add_columns(bm25_rank).limit(limit))
+        return [((rank, -post.id), post) for post, rank in rows]
+    posts = await db.scalars(_substring_statement(terms).limit(limit))
+    return [((-post.created_at.timestamp(), -post.id), post) for post in posts]
+
+
+async def search_sharded_posts(
+    shards: PostShards, terms: list[str], limit: int, offset: int
+) -> list[models.Post]:
+    """search_posts across post shards: each returns its best matches, merged by rank.
+
+    bm25 scores use per-shard term statistics, which are close to the global ones when
+    owners are spread evenly. Deep pages cost ``offset + limit`` rows per shard.
+    """
+    per_shard = await shards.fan_out(lambda db: _ranked_matches(db, terms, offset + limit))
+    merged = heapq.merge(*per_shard, key=lambda match: match[0])
+    return [post for _, post in itertools.islice(merged, offset, offset + limit)]
@@ -1,27 +1,160 @@
+import math
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 
-import bleach
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app import models, schemas
+from app import models, sanitizer, schemas
+from app.cache import TTLCache
 from app.config import get_settings
-from app.db import get_db
+from app.db import get_read_db
+from app.hashing import HashingBusyError, PasswordHasher
+from app.metrics import (
+    CallbackMetric,
+    password_hashing_duration,
+    registry,
+    sanitize_duration,
+    token_decode_duration,
+)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 reusable_oauth2 = HTTPBearer(auto_error=False)
 settings = get_settings()
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers, queue_size=settings.password_hash_queue_size
+)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Identity of the authenticated user, detached from any database session."""
+
+    id: int
+    username: str
+
+
+# Keyed by the raw bearer token; an entry never outlives the token's ``exp`` claim.
+principal_cache: TTLCache[Principal] = TTLCache(maxsize=settings.principal_cache_size)
+
+
+registry.register(
+    CallbackMetric(
+        "principal_cache_hits_total",
+        "Principal cache hits.",
+        lambda: principal_cache.hits,
+        "counter",
+    )
+)
+registry.register(
+    CallbackMetric(
+        "principal_cache_misses_total",
+        "Principal cache misses.",
+        lambda: principal_cache.misses,
+        "counter",
+    )
+)
+registry.register(
+    CallbackMetric(
+        "password_hashing_pending",
+        "Password hash jobs queued or running.",
+        lambda: password_hasher.pending,
+    )
+)
+
+
+def invalidate_user(username: str) -> int:
+    """Drop cached principals for ``username``; call after deleting or changing a user."""
+    return principal_cache.discard_where(lambda principal: principal.username == username)
+
+
+@lru_cache
+def get_pwd_context(rounds: int | None = None):
+    # passlib and the bcrypt backend are loaded on first use, mostly in hashing workers.
+    from passlib.context import CryptContext
+
+    rounds = rounds or settings.bcrypt_rounds
+    # Hashes below the current cost (or above the ceiling) are flagged by needs_update.
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=max(rounds, settings.bcrypt_max_rounds),
+    )
+
+
+def calibrate_bcrypt_rounds(
+    target_ms: float, min_rounds: int, max_rounds: int, samples: int = 3
+) -> int:
+    """Return the bcrypt cost whose hash time on this machine is closest to ``target_ms``.
+
+    Times the cheapest allowed cost and extrapolates, since every extra round doubles
+    the work; comparing in log space picks the nearest cost rather than the next one up.
+    """
+    context = get_pwd_context(min_rounds)
+    elapsed = math.inf
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.hash("calibration")
+        elapsed = min(elapsed, time.perf_counter() - started)
+    rounds = min_rounds + round(math.log2(target_ms / 1000 / elapsed))
+    return max(min_rounds, min(max_rounds, rounds))
+
+
+@lru_cache
+def get_bcrypt_rounds() -> int:
+    """Cost used for new hashes; calibrated once per process, warmed up by the lifespan."""
+    if not settings.bcrypt_calibrate_on_startup:
+        return settings.bcrypt_rounds
+    return calibrate_bcrypt_rounds(
+        settings.bcrypt_target_ms, settings.bcrypt_min_rounds, settings.bcrypt_max_rounds
+    )
+
+
+def bcrypt_cost(password_hash: str) -> int | None:
+    """Cost factor of a ``$2b$12$...`` style hash, or None for anything else."""
+    parts = password_hash.split("$")
+    if len(parts) < 4 or not parts[1].startswith("2") or not parts[2].isdigit():
+        return None
+    return int(parts[2])
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+def get_password_hash(password: str, rounds: int | None = None) -> str:
+    return get_pwd_context(rounds).hash(password)
 
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+def password_needs_rehash(hashed_password: str) -> bool:
+    # Only parses the hash, so it is cheap enough to run on the event loop.
+    return get_pwd_context(get_bcrypt_rounds()).needs_update(hashed_password)
+
+
+async def _run_hasher(operation: str, func, *args):
+    try:
+        with password_hashing_duration.time(operation=operation):
+            return await password_hasher.run(func, *args)
+    except HashingBusyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, retry later",
+            headers={"Retry-After": str(settings.password_hash_retry_after_seconds)},
+        ) from exc
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hasher("verify", verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hasher("hash", get_password_hash, password, get_bcrypt_rounds())
 
 
 def create_access_token(*, subject: str, expires_delta: timedelta | None = None) -> str:
@@ -34,7 +167,8 @@ def create_access_token(*, subject: str, expires_delta: timedelta | None = None)
 
 def decode_access_token(token: str) -> schemas.TokenPayload:
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])
+        with token_decode_duration.time():
+            payload = jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])
         subject = payload.get("sub")
         exp = payload.get("exp")
         if subject is None or exp is None:
@@ -48,17 +182,30 @@ def decode_access_token(token: str) -> schemas.TokenPayload:
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(reusable_oauth2),
-    db: Session = Depends(get_db),
-) -> models.User:
+    db: AsyncSession = Depends(get_read_db),
+) -> Principal:
     if credentials is None or credentials.scheme.lower() != "bearer":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing credentials")
 
-    token_data = decode_access_token(credentials.credentials)
-    user = db.query(models.User).filter(models.User.username == token_data.sub).first()
+    token = credentials.credentials
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    token_data = decode_access_token(token)
+    user = await db.scalar(select(models.User).where(models.User.username == token_data.sub))
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+
+    principal = Principal(id=user.id, username=user.username)
+    principal_cache.set(
+        token,
+        principal,
+        expires_at=min(token_data.exp, time.time() + settings.principal_cache_ttl_seconds),
+    )
+    return principal
 
 
 def sanitize_html(value: str) -> str:
-    return bleach.clean(value, strip=True)
+    with sanitize_duration.time(site="sanitize_html"):
+        return sanitizer.clean(value)
@@ -0,0 +1,307 @@
+"""Posts partitioned by owner across several SQLite files.
+
+SQLite lets one writer at a time into a file, so with ``post_shard_urls`` set every post
+lives on the shard its owner hashes to and writes to different shards run in parallel.
+Users and authentication stay on ``database_url``. Each shard carries its own
+``feed_state`` row (version and totals) and its own post id sequence, so creating a post
+never touches the primary database. Feed-wide reads fan out to every shard and k-way
+merge the results.
+
+Post ids stay unique across shards: shard ``i`` hands out ``n * MAX_SHARDS + i``. After
+the shard list changes, ``infosec-api rebalance-shards`` moves posts to their new home
+and restarts every sequence above the largest existing id.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+from collections import defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Sequence
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from sqlalchemy import (
+    DDL,
+    Column,
+    Engine,
+    Integer,
+    MetaData,
+    Row,
+    Select,
+    Table,
+    case,
+    delete,
+    event,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import models
+from app.config import get_settings
+from app.db import Base, insert_returning, make_async_engine, make_engine
+from app.feed import bump_feed_version, get_feed_version
+from app.stats import reconcile_feed_totals, record_new_posts
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+# Upper bound on the shard count; it is the stride between the ids a shard allocates.
+MAX_SHARDS = 256
+
+posts = models.Post.__table__
+feed_state = models.FeedState.__table__
+
+shard_metadata = MetaData()
+post_id_seq = Table(
+    "post_id_seq",
+    shard_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("last", Integer, nullable=False),
+)
+event.listen(post_id_seq, "after_create", DDL("INSERT INTO post_id_seq (id, last) VALUES (1, 0)"))
+
+
+def shard_for(owner_id: int, shard_count: int) -> int:
+    """Jump consistent hash: going from n to n + 1 shards moves only 1/(n + 1) of owners."""
+    key = owner_id & 0xFFFFFFFFFFFFFFFF
+    bucket, candidate = -1, 0
+    while candidate < shard_count:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+def create_shard_schema(engine: Engine) -> None:
+    """Create the posts (with its search index), feed_state and id sequence tables."""
+    Base.metadata.create_all(bind=engine, tables=[posts, feed_state])
+    shard_metadata.create_all(bind=engine)
+
+
+def create_shard_schemas() -> None:
+    for url in settings.post_shard_urls:
+        engine = make_engine(url)
+        try:
+            create_shard_schema(engine)
+        finally:
+            engine.dispose()
+
+
+class PostShards:
+    """Async session factories for the post shards, routed by post owner."""
+
+    def __init__(self, urls: Sequence[str], **engine_options: Any) -> None:
+        if not 0 < len(urls) <= MAX_SHARDS:
+            raise ValueError(f"Between 1 and {MAX_SHARDS} post shards are supported")
+        self.urls = list(urls)
+        self.session_factories = [
+            async_sessionmaker(
+                bind=make_async_engine(url, **engine_options),
+                autoflush=False,
+                expire_on_commit=False,
+            )
+            for url in self.urls
+        ]
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def index_for(self, owner_id: int) -> int:
+        return shard_for(owner_id, len(self))
+
+    def session_for(self, owner_id: int) -> AsyncSession:
+        return self.session_factories[self.index_for(owner_id)]()
+
+    async def fan_out(self, query: Callable[[AsyncSession], Awaitable[T]]) -> list[T]:
+        """Run ``query`` on every shard concurrently, each in its own session."""
+
+        async def run(factory: async_sessionmaker[AsyncSession]) -> T:
+            async with factory() as db:
+                return await query(db)
+
+        return await asyncio.gather(*(run(factory) for factory in self.session_factories))
+
+    async def feed_version(self) -> int:
+        # Shard versions only grow, so their sum changes on every write anywhere.
+        return sum(await self.fan_out(get_feed_version))
+
+    async def newest_first(self, stmt: Select, limit: int) -> list[Row]:
+        """The first ``limit`` rows of ``stmt`` across shards, newest ``(created_at, id)`` first.
+
+        ``stmt`` must already be ordered that way (see ``keyset_statement``) and limited to
+        at least ``limit`` rows, so each shard returns one sorted page and they are merged.
+        """
+
+        async def page(db: AsyncSession) -> Sequence[Row]:
+            return (await db.execute(stmt)).all()
+
+        pages = await self.fan_out(page)
+        merged = heapq.merge(*pages, key=_post_order, reverse=True)
+        return list(itertools.islice(merged, limit))
+
+    async def stream_oldest_first(self, stmt: Select, chunk_size: int) -> AsyncIterator[list[Row]]:
+        """Stream ``stmt`` (ordered by ``created_at, id``) from every shard, merged in order.
+
+        Each shard is read through a server-side cursor ``chunk_size`` rows at a time, so
+        memory stays bounded by the shard count times the chunk size.
+        """
+        async with contextlib.AsyncExitStack() as stack:
+            cursors = []
+            for factory in self.session_factories:
+                db = await stack.enter_async_context(factory())
+                result = await db.stream(stmt.execution_options(yield_per=chunk_size))
+                stack.push_async_callback(result.close)
+                cursors.append(aiter(result))
+
+            heap = []
+            for index, cursor in enumerate(cursors):
+                row = await anext(cursor, None)
+                if row is not None:
+                    heap.append((_post_order(row), index, row))
+            heapq.heapify(heap)
+
+            chunk: list[Row] = []
+            while heap:
+                _, index, row = heap[0]
+                chunk.append(row)
+                following = await anext(cursors[index], None)
+                if following is None:
+                    heapq.heappop(heap)
+                else:
+                    heapq.heapreplace(heap, (_post_order(following), index, following))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+
+def _post_order(row) -> tuple:
+    return row.created_at, row.id
+
+
+async def write_posts(
+    db: AsyncSession, shard_index: int, rows: Sequence[dict[str, Any]]
+) -> list[models.Post]:
+    """Insert ``rows`` on one shard with fresh ids and update its feed state; no commit."""
+    bump = (
+        update(post_id_seq).where(post_id_seq.c.id == 1).values(last=post_id_seq.c.last + len(rows))
+    )
+    if db.get_bind().dialect.update_returning:
+        last = await db.scalar(bump.returning(post_id_seq.c.last))
+    else:
+        # The UPDATE holds the row lock, so reading it back in this transaction is safe.
+        await db.execute(bump)
+        last = await db.scalar(select(post_id_seq.c.last).where(post_id_seq.c.id == 1))
+    first = last - len(rows) + 1
+    rows = [
+        {**row, "id": (first + offset) * MAX_SHARDS + shard_index}
+        for offset, row in enumerate(rows)
+    ]
+    new_posts = await insert_returning(db, models.Post, rows)
+    await record_new_posts(
+        db, [(post.owner_id, post.created_at) for post in new_posts], per_user=False
+    )
+    await bump_feed_version(db)
+    return list(new_posts)
+
+
+@lru_cache
+def get_post_shards() -> PostShards | None:
+    """Dependency returning the post shards, or None when posts live on the primary."""
+    if not settings.post_shard_urls:
+        return None
+    return PostShards(settings.post_shard_urls)
+
+
+def rebalance_posts(
+    shard_urls: Sequence[str], extra_sources: Iterable[str] = (), batch_size: int = 1000
+) -> dict:
+    """Move every post to its home shard under ``shard_urls``.
+
+    Reads the configured shards plus ``extra_sources`` (retired shards, or the primary
+    database when switching sharding on). Each batch is copied to its new shard before it
+    is deleted from the old one and copies skip ids already present, so an interrupted
+    run can simply be repeated. Run it while the API is stopped.
+    """
+    targets = [make_engine(url) for url in shard_urls]
+    sources = list(enumerate(targets)) + [
+        (None, make_engine(url)) for url in dict.fromkeys(extra_sources) if url not in shard_urls
+    ]
+    try:
+        for engine in targets:
+            create_shard_schema(engine)
+        # Raise every shard's version past the old total so no ETag or cached page from
+        # the previous layout can match the new one.
+        version_floor = 1 + sum(_feed_version(engine) for _, engine in sources)
+
+        scanned = moved = 0
+        for own_index, engine in sources:
+            last_id = None
+            while True:
+                stmt = select(posts).order_by(posts.c.id).limit(batch_size)
+                if last_id is not None:
+                    stmt = stmt.where(posts.c.id > last_id)
+                with engine.connect() as conn:
+                    rows = conn.execute(stmt).mappings().all()
+                if not rows:
+                    break
+                last_id = rows[-1]["id"]
+                scanned += len(rows)
+
+                misplaced: dict[int, list[dict]] = defaultdict(list)
+                for row in rows:
+                    home = shard_for(row["owner_id"], len(targets))
+                    if home != own_index:
+                        misplaced[home].append(dict(row))
+                for home, batch in misplaced.items():
+                    with targets[home].begin() as conn:
+                        conn.execute(
+                            sqlite.insert(posts).on_conflict_do_nothing(index_elements=["id"]),
+                            batch,
+                        )
+                moved_ids = [row["id"] for batch in misplaced.values() for row in batch]
+                if moved_ids:
+                    with engine.begin() as conn:
+                        conn.execute(delete(posts).where(posts.c.id.in_(moved_ids)))
+                    moved += len(moved_ids)
+
+        with contextlib.ExitStack() as stack:
+            conns = [stack.enter_context(engine.connect()) for engine in targets]
+            max_id = max(conn.scalar(select(func.max(posts.c.id))) or 0 for conn in conns)
+        next_block = max_id // MAX_SHARDS + 1
+        per_shard = []
+        for engine in targets:
+            with engine.begin() as conn:
+                reconcile_feed_totals(conn)
+                conn.execute(
+                    update(feed_state)
+                    .where(feed_state.c.id == 1)
+                    .values(version=feed_state.c.version + version_floor)
+                )
+                conn.execute(
+                    update(post_id_seq)
+                    .where(post_id_seq.c.id == 1)
+                    .values(
+                        last=case(
+                            (post_id_seq.c.last < next_block, next_block),
+                            else_=post_id_seq.c.last,
+                        )
+                    )
+                )
+                per_shard.append(conn.scalar(select(func.count()).select_from(posts)))
+    finally:
+        for _, engine in sources:
+            engine.dispose()
+
+    return {"shards": len(targets), "scanned": scanned, "moved": moved, "posts": per_shard}
+
+
+def _feed_version(engine: Engine) -> int:
+    with engine.connect() as conn:
+        return conn.scalar(select(feed_state.c.version).where(feed_state.c.id == 1)) or 0
@@ -0,0 +1,92 @@
+"""Denormalized post counters kept on users and on the feed_state row."""
+
+from collections.abc import Iterable
+from datetime import datetime
+
+from sqlalchemy import Connection, bindparam, case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+
+users = models.User.__table__
+posts = models.Post.__table__
+feed_state = models.FeedState.__table__
+
+
+def _later(column, value):
+    # Portable max(column, value) that treats NULL as "no posts yet".
+    return case((or_(column.is_(None), column < value), value), else_=column)
+
+
+async def record_new_posts(
+    db: AsyncSession, new_posts: Iterable[tuple[int, datetime]], per_user: bool = True
+) -> None:
+    """Add ``(owner_id, created_at)`` pairs to the counters, inside the writing transaction.
+
+    Post shards have no users table, so they pass ``per_user=False`` and only keep the
+    feed totals.
+    """
+    per_owner: dict[int, tuple[int, datetime]] = {}
+    for owner_id, created_at in new_posts:
+        count, latest = per_owner.get(owner_id, (0, created_at))
+        per_owner[owner_id] = (count + 1, max(latest, created_at))
+    if not per_owner:
+        return
+
+    if per_user:
+        await db.execute(
+            update(users)
+            .where(users.c.id == bindparam("b_owner_id"))
+            .values(
+                post_count=users.c.post_count + bindparam("b_count"),
+                last_post_at=_later(users.c.last_post_at, bindparam("b_latest")),
+            ),
+            [
+                {"b_owner_id": owner_id, "b_count": count, "b_latest": latest}
+                for owner_id, (count, latest) in per_owner.items()
+            ],
+        )
+    await db.execute(
+        update(feed_state)
+        .where(feed_state.c.id == 1)
+        .values(
+            post_count=feed_state.c.post_count + sum(count for count, _ in per_owner.values()),
+            last_post_at=_later(
+                feed_state.c.last_post_at, max(latest for _, latest in per_owner.values())
+            ),
+        )
+    )
+
+
+def reconcile_stats(conn: Connection) -> dict[str, int]:
+    """Rebuild every counter from the posts table; returns how many users had drifted."""
+    # Correlated per user, each answered from ix_posts_owner_created_id.
+    expected_count = select(func.count()).where(posts.c.owner_id == users.c.id).scalar_subquery()
+    expected_latest = (
+        select(func.max(posts.c.created_at)).where(posts.c.owner_id == users.c.id).scalar_subquery()
+    )
+    drifted = conn.scalar(
+        select(func.count())
+        .select_from(users)
+        .where(
+            or_(
+                users.c.post_count != expected_count,
+                users.c.last_post_at.is_distinct_from(expected_latest),
+            )
+        )
+    )
+    conn.execute(update(users).values(post_count=expected_count, last_post_at=expected_latest))
+    reconcile_feed_totals(conn)
+    return {"users_fixed": drifted or 0}
+
+
+def reconcile_feed_totals(conn: Connection) -> None:
+    """Rebuild the feed_state totals from the posts table of the same database."""
+    conn.execute(
+        update(feed_state)
+        .where(feed_state.c.id == 1)
+        .values(
+            post_count=select(func.count()).select_from(posts).scalar_subquery(),
+            last_post_at=select(func.max(posts.c.created_at)).scalar_subquery(),
+        )
+    )
@@ -1,16 +1,38 @@
-from collections.abc import Generator
+import os
+from collections.abc import AsyncGenerator, Generator
 
-import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+TEST_DATABASE_URL = "sqlite:///./test.db"
+# Settings are read on import, so point the app at the test database before importing it.
+# Tables come from reset_database, not from the lifespan.
+os.environ["APP_DATABASE_URL"] = TEST_DATABASE_URL
+os.environ["APP_CREATE_SCHEMA_ON_STARTUP"] = "false"
 
-from app.db import Base, get_db
-from app.main import app
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from app.db import (  # noqa: E402
+    Base,
+    get_async_db,
+    get_db,
+    get_read_sessionmaker,
+    make_async_engine,
+)
+from app.feed import feed_cache  # noqa: E402
+from app.main import app  # noqa: E402
+from app.ratelimit import ip_limiter, username_limiter  # noqa: E402
+from app.security import principal_cache  # noqa: E402
 
-TEST_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+# Every TestClient runs its own event loop, so async connections must not be pooled across tests.
+async_engine = make_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 
 @pytest.fixture(autouse=True)
@@ -21,6 +43,15 @@ def reset_database() -> Generator[None, None, None]:
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def reset_caches() -> Generator[None, None, None]:
+    for cache in (principal_cache, feed_cache, ip_limiter, username_limiter):
+        cache.clear()
+    yield
+    for cache in (principal_cache, feed_cache, ip_limiter, username_limiter):
+        cache.clear()
+
+
 @pytest.fixture()
 def client() -> Generator[TestClient, None, None]:
     def override_get_db() -> Generator:
@@ -30,7 +61,13 @@ def client() -> Generator[TestClient, None, None]:
         finally:
             db.close()
 
+    async def override_get_async_db() -> AsyncGenerator:
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_sessionmaker] = lambda: TestingAsyncSessionLocal
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+
+import httpx
+from conftest import TEST_DATABASE_URL
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.db import make_async_engine, to_async_url
+from app.main import app
+
+QUERY_SECONDS = 0.2
+
+
+def _register_and_login(client: TestClient) -> str:
+    username = f"user_{uuid.uuid4().hex[:8]}"
+    password = "StrongPass123!"
+    res = client.post("/auth/register", json={"username": username, "password": password})
+    assert res.status_code == 201, res.text
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    assert res.status_code == 200, res.text
+    return res.json()["access_token"]
+
+
+def _slow_session_factory() -> async_sessionmaker:
+    engine = make_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _register_sleep(dbapi_connection, _):
+        dbapi_connection.create_function("slow", 1, lambda seconds: time.sleep(seconds) or 1)
+
+    return async_sessionmaker(bind=engine, expire_on_commit=False)
+
+
+async def _run_slow_queries(factory: async_sessionmaker, clients: int) -> tuple[float, float]:
+    async def slow_query() -> None:
+        async with factory() as session:
+            await session.execute(text("SELECT slow(:s)"), {"s": QUERY_SECONDS})
+
+    max_lag = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat() -> None:
+        nonlocal max_lag
+        while not done.is_set():
+            tick = time.perf_counter()
+            await asyncio.sleep(0.01)
+            max_lag = max(max_lag, time.perf_counter() - tick - 0.01)
+
+    beat = asyncio.create_task(heartbeat())
+    started = time.perf_counter()
+    await asyncio.gather(*(slow_query() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await beat
+    return elapsed, max_lag
+
+
+def test_async_url_is_derived_from_database_url():
+    assert to_async_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert to_async_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert to_async_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+def test_slow_queries_do_not_block_the_event_loop():
+    factory = _slow_session_factory()
+
+    serial, _ = asyncio.run(_run_slow_queries(factory, 1))
+    concurrent, max_lag = asyncio.run(_run_slow_queries(factory, 8))
+
+    # Eight clients finish in far less than eight times the single-client wall time,
+    # and the loop keeps ticking while the queries run.
+    assert concurrent < serial * 4
+    assert max_lag < QUERY_SECONDS / 2
+
+
+def test_concurrent_requests_are_served(client: TestClient):
+    token = _register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def burst() -> list[int]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            await http.post("/api/posts", headers=headers, json={"title": "t", "content": "c"})
+            responses = await asyncio.gather(
+                *(http.get("/api/posts", headers=headers) for _ in range(16))
+            )
+        return [response.status_code for response in responses]
+
+    assert asyncio.run(burst()) == [200] * 16
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import uuid
+
+from conftest import async_engine
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import get_settings
+
+settings = get_settings()
+
+
+def _register_and_login(client: TestClient) -> str:
+    username = f"user_{uuid.uuid4().hex[:8]}"
+    password = "StrongPass123!"
+    res = client.post("/auth/register", json={"username": username, "password": password})
+    assert res.status_code == 201, res.text
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    assert res.status_code == 200, res.text
+    return res.json()["access_token"]
+
+
+def _auth(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_batch_creates_valid_items_and_reports_invalid_ones(
+    client: TestClient, db_session: Session
+):
+    token = _register_and_login(client)
+    batch = [
+        {"title": "First", "content": "one"},
+        {"title": "", "content": "empty title"},
+        {"title": "Second <script>alert(1)</script>", "content": "two"},
+        {"title": "<script></script>", "content": "stripped"},
+        {"content": "missing title"},
+        {"title": "Third", "content": "three"},
+    ]
+
+    res = client.post("/api/posts/batch", headers=_auth(token), json=batch)
+    assert res.status_code == 201, res.text
+    body = res.json()
+
+    assert [item["title"] for item in body["items"]] == ["First", "Second alert(1)", "Third"]
+    assert len({item["id"] for item in body["items"]}) == 3
+    assert [error["index"] for error in body["errors"]] == [1, 3, 4]
+    assert "Title removed by sanitizer" in body["errors"][1]["detail"]
+    assert "title" in body["errors"][2]["detail"]
+    assert db_session.query(models.Post).count() == 3
+
+
+def test_batch_with_no_valid_items_is_rejected(client: TestClient, db_session: Session):
+    token = _register_and_login(client)
+    res = client.post("/api/posts/batch", headers=_auth(token), json=[{"title": "x"}])
+    assert res.status_code == 422
+    assert res.json()["detail"][0]["index"] == 0
+    assert db_session.query(models.Post).count() == 0
+
+
+def test_batch_size_is_limited(client: TestClient):
+    token = _register_and_login(client)
+    batch = [{"title": "t", "content": "c"}] * (settings.post_batch_max_items + 1)
+    res = client.post("/api/posts/batch", headers=_auth(token), json=batch)
+    assert res.status_code == 422
+    assert "Batch exceeds" in res.json()["detail"]
+
+
+def test_batch_requires_authentication(client: TestClient):
+    res = client.post("/api/posts/batch", json=[{"title": "t", "content": "c"}])
+    assert res.status_code == 401
+
+
+def test_non_object_items_are_reported_per_item(client: TestClient, db_session: Session):
+    token = _register_and_login(client)
+    batch = [None, "just a string", {"title": "Kept", "content": "body"}, [1, 2]]
+
+    res = client.post("/api/posts/batch", headers=_auth(token), json=batch)
+
+    assert res.status_code == 201, res.text
+    body = res.json()
+    assert [item["title"] for item in body["items"]] == ["Kept"]
+    assert [error["index"] for error in body["errors"]] == [0, 1, 3]
+    assert db_session.query(models.Post).count() == 1
+
+
+def test_batch_without_ordered_returning_falls_back_to_orm_inserts(
+    client: TestClient, db_session: Session, monkeypatch
+):
+    # Backends such as MySQL cannot return inserted rows in parameter order.
+    monkeypatch.setattr(
+        async_engine.dialect, "insert_executemany_returning_sort_by_parameter_order", False
+    )
+    token = _register_and_login(client)
+    batch = [{"title": f"Post {idx}", "content": "body"} for idx in range(3)]
+
+    res = client.post("/api/posts/batch", headers=_auth(token), json=batch)
+    assert res.status_code == 201, res.text
+    items = res.json()["items"]
+
+    assert [item["title"] for item in items] == ["Post 0", "Post 1", "Post 2"]
+    stored = {post.id: post.title for post in db_session.query(models.Post)}
+    assert {item["id"]: item["title"] for item in items} == stored
+    assert all(item["created_at"] for item in items)
+    assert client.get("/api/stats", headers=_auth(token)).json()["total_posts"] == 3
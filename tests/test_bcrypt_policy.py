@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+from conftest import TestingAsyncSessionLocal
+from fastapi.testclient import TestClient
+
+from app import models, security
+
+
+def test_calibration_stays_within_bounds():
+    assert security.calibrate_bcrypt_rounds(0.001, 4, 8, samples=1) == 4
+    assert security.calibrate_bcrypt_rounds(10**9, 4, 8, samples=1) == 8
+
+
+def test_bcrypt_cost_is_parsed_from_the_hash():
+    assert security.bcrypt_cost(security.get_password_hash("secret", 5)) == 5
+    assert security.bcrypt_cost("$argon2id$v=19$m=65536,t=3,p=4$abc") is None
+    assert security.bcrypt_cost("plain") is None
+
+
+def _seed_user(db_session, username: str, password: str, rounds: int) -> None:
+    password_hash = security.get_password_hash(password, rounds)
+    db_session.add(models.User(username=username, password_hash=password_hash))
+    db_session.commit()
+
+
+def _stored_cost(db_session, username: str) -> int | None:
+    db_session.expire_all()
+    user = db_session.query(models.User).filter_by(username=username).one()
+    return security.bcrypt_cost(user.password_hash)
+
+
+def test_login_rehashes_weak_hashes_in_the_background(client: TestClient, db_session, monkeypatch):
+    # The background task opens its own session rather than reusing the request's.
+    monkeypatch.setattr("app.routers.auth.get_async_sessionmaker", lambda: TestingAsyncSessionLocal)
+    _seed_user(db_session, "legacy_user", "Password123!", rounds=4)
+
+    res = client.post("/auth/login", json={"username": "legacy_user", "password": "Password123!"})
+
+    assert res.status_code == 200
+    # TestClient runs background tasks before returning the response.
+    assert _stored_cost(db_session, "legacy_user") == security.get_bcrypt_rounds()
+    again = client.post("/auth/login", json={"username": "legacy_user", "password": "Password123!"})
+    assert again.status_code == 200
+
+
+def test_login_keeps_hashes_that_are_in_policy(client: TestClient, db_session, monkeypatch):
+    rounds = security.get_bcrypt_rounds()
+    _seed_user(db_session, "current_user", "Password123!", rounds=rounds)
+    rehashed = []
+    monkeypatch.setattr("app.routers.auth._rehash_password", lambda *args: rehashed.append(args))
+
+    res = client.post("/auth/login", json={"username": "current_user", "password": "Password123!"})
+
+    assert res.status_code == 200
+    assert rehashed == []
+    assert _stored_cost(db_session, "current_user") == rounds
+
+
+def test_hash_report_counts_costs(tmp_path):
+    database = tmp_path / "report.db"
+    env = {
+        **os.environ,
+        "APP_DATABASE_URL": f"sqlite:///{database}",
+        "APP_BCRYPT_CALIBRATE_ON_STARTUP": "false",
+        "APP_BCRYPT_ROUNDS": "6",
+    }
+    subprocess.run([sys.executable, "-m", "app.cli", "init-db"], env=env, check=True)
+    hashes = [security.get_password_hash("pw", 4), security.get_password_hash("pw", 6), "legacy"]
+    with sqlite3.connect(database) as conn:
+        conn.executemany(
+            "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+            [(f"user_{index}", value) for index, value in enumerate(hashes)],
+        )
+
+    result = subprocess.run(
+        [sys.executable, "-m", "app.cli", "hash-report"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    report = json.loads(result.stdout)
+    assert report["current_rounds"] == 6
+    assert report["costs"] == {"4": 1, "6": 1, "other": 1}
+    assert report["below_current"] == 1
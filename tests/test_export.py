@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app import models
+from app.routers import posts
+
+
+def _register_and_login(client: TestClient, username: str, password: str) -> str:
+    client.post("/auth/register", json={"username": username, "password": password})
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    assert res.status_code == 200
+    return res.json()["access_token"]
+
+
+def _auth(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _export(client: TestClient, token: str, **params) -> list[dict]:
+    res = client.get("/api/posts/export", headers=_auth(token), params=params)
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in res.text.splitlines()]
+
+
+def test_export_streams_every_post_oldest_first(client: TestClient, monkeypatch):
+    monkeypatch.setattr(posts.settings, "export_chunk_size", 2)
+    token = _register_and_login(client, "exporter", "Password123!")
+    batch = [{"title": f"Post {idx}", "content": "Body"} for idx in range(5)]
+    client.post("/api/posts/batch", json=batch, headers=_auth(token))
+
+    rows = _export(client, token)
+
+    assert [row["title"] for row in rows] == [f"Post {idx}" for idx in range(5)]
+    assert set(rows[0]) == {"id", "title", "content", "owner_id", "created_at"}
+
+
+def test_export_since_returns_only_newer_posts(client: TestClient):
+    token = _register_and_login(client, "incremental", "Password123!")
+    for title in ("old", "older"):
+        client.post("/api/posts", json={"title": title, "content": "Body"}, headers=_auth(token))
+    first = _export(client, token)
+    client.post("/api/posts", json={"title": "new", "content": "Body"}, headers=_auth(token))
+
+    rows = _export(client, token, since=first[-1]["created_at"])
+
+    assert [row["title"] for row in rows] == ["new"]
+
+
+def test_export_resumes_inside_a_shared_timestamp(client: TestClient, db_session):
+    token = _register_and_login(client, "resumer", "Password123!")
+    batch = [{"title": f"Post {idx}", "content": "Body"} for idx in range(4)]
+    client.post("/api/posts/batch", json=batch, headers=_auth(token))
+    db_session.execute(update(models.Post).values(created_at=datetime(2024, 1, 1, 12, 0)))
+    db_session.commit()
+    first = _export(client, token)
+
+    rows = _export(client, token, since=first[1]["created_at"], after_id=first[1]["id"])
+
+    assert [row["id"] for row in rows] == [row["id"] for row in first[2:]]
+    assert _export(client, token, since=first[1]["created_at"]) == []
+
+
+def test_export_requires_authentication(client: TestClient):
+    assert client.get("/api/posts/export").status_code == 401
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import uuid
+
+from conftest import async_engine
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.feed import etag_matches
+
+
+def _register_and_login(client: TestClient) -> str:
+    username = f"user_{uuid.uuid4().hex[:8]}"
+    password = "StrongPass123!"
+    res = client.post("/auth/register", json={"username": username, "password": password})
+    assert res.status_code == 201, res.text
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    assert res.status_code == 200, res.text
+    return res.json()["access_token"]
+
+
+def _auth(token: str, **extra: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}", **extra}
+
+
+def test_unchanged_feed_answers_304_without_reading_posts(client: TestClient):
+    token = _register_and_login(client)
+    client.post("/api/posts", headers=_auth(token), json={"title": "t", "content": "c"})
+
+    first = client.get("/api/posts", headers=_auth(token))
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        cached = client.get("/api/posts", headers=_auth(token, **{"If-None-Match": etag}))
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+    assert not any("FROM posts" in statement for statement in statements)
+
+
+def test_write_changes_the_etag(client: TestClient):
+    token = _register_and_login(client)
+    first = client.get("/api/posts", headers=_auth(token))
+    etag = first.headers["ETag"]
+
+    client.post("/api/posts", headers=_auth(token), json={"title": "new", "content": "post"})
+
+    res = client.get("/api/posts", headers=_auth(token, **{"If-None-Match": etag}))
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+    assert [item["title"] for item in res.json()["items"]] == ["new"]
+
+
+def test_each_page_has_its_own_etag(client: TestClient):
+    token = _register_and_login(client)
+    small = client.get("/api/posts", headers=_auth(token), params={"limit": 1})
+    large = client.get("/api/posts", headers=_auth(token), params={"limit": 2})
+    assert small.headers["ETag"] != large.headers["ETag"]
+
+
+def test_if_none_match_parsing():
+    assert etag_matches('"1-a", "2-b"', '"2-b"')
+    assert etag_matches('W/"2-b"', '"2-b"')
+    assert etag_matches("*", '"2-b"')
+    assert not etag_matches(None, '"2-b"')
+    assert not etag_matches('"1-a"', '"2-b"')
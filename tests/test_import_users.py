@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+from conftest import engine
+
+from app import models, security
+from app.importer import import_users, read_user_rows
+
+
+def _write_jsonl(path, rows: list) -> None:
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n")
+
+
+def test_import_creates_users_and_reports_failures(tmp_path, db_session):
+    db_session.add(models.User(username="taken", password_hash=security.get_password_hash("pw", 4)))
+    db_session.commit()
+    source = tmp_path / "users.jsonl"
+    _write_jsonl(
+        source,
+        [
+            {"username": "alice", "password": "Password1!"},
+            {"username": "taken", "password": "Password1!"},
+            {"username": "al", "password": "Password1!"},
+            {"username": "bob", "password": "Password1!"},
+            {"username": "alice", "password": "Another1!"},
+            ["not", "an", "object"],
+        ],
+    )
+
+    report = import_users(engine, read_user_rows(source), rounds=4, workers=1, batch_size=2)
+
+    assert report.summary()["created"] == 2
+    assert sorted((failure.line, failure.username) for failure in report.failures) == [
+        (2, "taken"),
+        (3, "al"),
+        (5, "alice"),
+        (6, None),
+    ]
+    users = {user.username: user for user in db_session.query(models.User)}
+    assert set(users) == {"taken", "alice", "bob"}
+    assert security.verify_password("Password1!", users["alice"].password_hash)
+    assert security.bcrypt_cost(users["bob"].password_hash) == 4
+
+
+def test_import_reads_csv(tmp_path, db_session):
+    source = tmp_path / "users.csv"
+    source.write_text("username,password,email\ncarol,Password1!,c@example.com\n")
+
+    report = import_users(engine, read_user_rows(source), rounds=4, workers=1)
+
+    assert report.failures == []
+    assert db_session.query(models.User).filter_by(username="carol").count() == 1
+
+
+def test_import_users_command(tmp_path):
+    database = tmp_path / "import.db"
+    source = tmp_path / "users.jsonl"
+    _write_jsonl(source, [{"username": "dave", "password": "Password1!"}, {"username": "x"}])
+    env = {
+        **os.environ,
+        "APP_DATABASE_URL": f"sqlite:///{database}",
+        "APP_BCRYPT_CALIBRATE_ON_STARTUP": "false",
+        "APP_BCRYPT_ROUNDS": "4",
+    }
+    subprocess.run([sys.executable, "-m", "app.cli", "init-db"], env=env, check=True)
+
+    result = subprocess.run(
+        [sys.executable, "-m", "app.cli", "import-users", str(source), "--workers", "1"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+
+    assert result.returncode == 1
+    assert json.loads(result.stdout)["created"] == 1
+    assert json.loads(result.stderr.splitlines()[-1])["line"] == 2
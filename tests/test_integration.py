@@ -38,8 +38,8 @@ def test_posts_crud_and_authentication(client: TestClient):
     listing = client.get("/api/posts", headers=_auth(token))
     assert listing.status_code == 200
     data = listing.json()
-    assert isinstance(data, list)
-    assert any(item["id"] == post["id"] for item in data)
+    assert isinstance(data["items"], list)
+    assert any(item["id"] == post["id"] for item in data["items"])
 
     unauth_get = client.get("/api/posts")
     assert unauth_get.status_code == 401
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import re
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.metrics import Counter, Histogram
+
+
+def _register_and_login(client: TestClient) -> tuple[str, int]:
+    username = f"user_{uuid.uuid4().hex[:8]}"
+    password = "StrongPass123!"
+    res = client.post("/auth/register", json={"username": username, "password": password})
+    assert res.status_code == 201, res.text
+    user_id = res.json()["id"]
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    assert res.status_code == 200, res.text
+    return res.json()["access_token"], user_id
+
+
+def _sample(body: str, name: str, **labels: str) -> float:
+    for line in body.splitlines():
+        if line.startswith("#"):
+            continue
+        metric, _, value = line.rpartition(" ")
+        if metric.split("{")[0] != name:
+            continue
+        found = dict(re.findall(r'(\w+)="([^"]*)"', metric))
+        if all(found.get(key) == expected for key, expected in labels.items()):
+            return float(value)
+    raise AssertionError(f"{name} {labels} not found")
+
+
+def test_metrics_report_routes_sql_and_hot_spots(client: TestClient):
+    token, user_id = _register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/api/posts", headers=headers, json={"title": "t", "content": "c"})
+    client.get(f"/api/users/{user_id}/posts", headers=headers)
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = res.text
+
+    route = {"method": "GET", "route": "/api/users/{user_id}/posts"}
+    assert _sample(body, "http_requests_total", status="200", **route) >= 1
+    assert _sample(body, "http_request_duration_seconds_count", **route) >= 1
+    assert _sample(body, "http_request_db_queries_sum", **route) >= 1
+    assert _sample(body, "http_request_db_duration_seconds_count", **route) >= 1
+    assert _sample(body, "db_queries_total") >= 1
+    assert _sample(body, "password_hashing_duration_seconds_count", operation="hash") >= 1
+    assert _sample(body, "password_hashing_duration_seconds_count", operation="verify") >= 1
+    assert _sample(body, "token_decode_duration_seconds_count") >= 1
+    assert _sample(body, "sanitize_duration_seconds_count", site="create_post") >= 1
+    assert _sample(body, "principal_cache_misses_total") >= 1
+
+
+def test_unmatched_paths_share_one_label(client: TestClient):
+    client.get("/no/such/path/1")
+    client.get("/no/such/path/2")
+    body = client.get("/metrics").text
+    assert _sample(body, "http_requests_total", route="<unmatched>", status="404") >= 2
+    assert "/no/such/path" not in body
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo.", ("op",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, op="x")
+    counter = Counter("demo_total", "Demo.", ("op",))
+    counter.inc(op='quote"d')
+
+    lines = list(histogram.render()) + list(counter.render())
+    assert 'demo_seconds_bucket{op="x",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{op="x",le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{op="x",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{op="x"} 3' in lines
+    assert 'demo_total{op="quote\\"d"} 1' in lines
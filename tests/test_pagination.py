@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.pagination import encode_cursor, encode_offset_cursor
+
+
+def _register_and_login(client: TestClient) -> tuple[str, str]:
+    username = f"user_{uuid.uuid4().hex[:8]}"
+    password = "StrongPass123!"
+    res = client.post("/auth/register", json={"username": username, "password": password})
+    assert res.status_code == 201, res.text
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    assert res.status_code == 200, res.text
+    return res.json()["access_token"], username
+
+
+def _auth(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _seed_posts(db_session: Session, username: str, count: int) -> None:
+    owner = db_session.query(models.User).filter(models.User.username == username).one()
+    # Pairs of posts share a timestamp so the id tie-breaker is exercised.
+    for idx in range(count):
+        db_session.add(
+            models.Post(
+                title=f"Post {idx}",
+                content="body",
+                owner_id=owner.id,
+                created_at=datetime(2024, 1, 1, 12, 0, idx // 2),
+            )
+        )
+    db_session.commit()
+
+
+def test_cursor_pagination_walks_every_post_once(client: TestClient, db_session: Session):
+    token, username = _register_and_login(client)
+    _seed_posts(db_session, username, 11)
+
+    seen: list[int] = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 4}
+        if cursor:
+            params["cursor"] = cursor
+        res = client.get("/api/posts", headers=_auth(token), params=params)
+        assert res.status_code == 200, res.text
+        page = res.json()
+        assert len(page["items"]) <= 4
+        seen.extend(item["id"] for item in page["items"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 11
+    expected = [
+        post.id
+        for post in db_session.query(models.Post).order_by(
+            models.Post.created_at.desc(), models.Post.id.desc()
+        )
+    ]
+    assert seen == expected
+
+
+def test_last_page_has_no_cursor(client: TestClient, db_session: Session):
+    token, username = _register_and_login(client)
+    _seed_posts(db_session, username, 3)
+
+    res = client.get("/api/posts", headers=_auth(token), params={"limit": 3})
+    assert res.status_code == 200
+    assert len(res.json()["items"]) == 3
+    assert res.json()["next_cursor"] is None
+
+
+def test_invalid_cursor_and_limit_are_rejected(client: TestClient):
+    token, _ = _register_and_login(client)
+
+    res = client.get("/api/posts", headers=_auth(token), params={"cursor": "not-a-cursor"})
+    assert res.status_code == 400
+    assert "Invalid cursor" in res.json()["detail"]
+
+    res = client.get("/api/posts", headers=_auth(token), params={"limit": 0})
+    assert res.status_code == 422
+    res = client.get("/api/posts", headers=_auth(token), params={"limit": 10_000})
+    assert res.status_code == 422
+
+
+def test_out_of_range_ids_in_cursors_are_rejected(client: TestClient):
+    token, _ = _register_and_login(client)
+    huge = 10**30
+
+    for path, cursor in (
+        ("/api/posts", encode_cursor(datetime(2024, 1, 1), huge)),
+        ("/api/posts", encode_cursor(datetime(2024, 1, 1), -1)),
+        ("/api/posts/search", encode_offset_cursor(huge)),
+    ):
+        res = client.get(path, headers=_auth(token), params={"cursor": cursor, "q": "x"})
+        assert res.status_code == 400, res.text
+        assert res.json()["detail"] == "Invalid cursor"
+
+    res = client.get(
+        "/api/posts/export",
+        headers=_auth(token),
+        params={"since": "2024-01-01T00:00:00", "after_id": huge},
+    )
+    assert res.status_code == 422
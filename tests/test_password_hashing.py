@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import security
+from app.hashing import HashingBusyError, PasswordHasher
+
+
+def test_hasher_round_trip():
+    hasher = PasswordHasher(workers=1, queue_size=0)
+
+    async def round_trip() -> tuple[bool, bool]:
+        hashed = await hasher.run(security.get_password_hash, "StrongPass123!")
+        good = await hasher.run(security.verify_password, "StrongPass123!", hashed)
+        bad = await hasher.run(security.verify_password, "wrong", hashed)
+        return good, bad
+
+    try:
+        assert asyncio.run(round_trip()) == (True, False)
+    finally:
+        hasher.shutdown()
+
+
+def test_hasher_rejects_work_when_queue_is_full():
+    hasher = PasswordHasher(workers=1, queue_size=1)
+
+    async def overload() -> None:
+        first = asyncio.create_task(hasher.run(security.get_password_hash, "one"))
+        second = asyncio.create_task(hasher.run(security.get_password_hash, "two"))
+        await asyncio.sleep(0)
+        assert hasher.pending == 2
+        with pytest.raises(HashingBusyError):
+            await hasher.run(security.get_password_hash, "three")
+        await asyncio.gather(first, second)
+        assert hasher.pending == 0
+
+    try:
+        asyncio.run(overload())
+    finally:
+        hasher.shutdown()
+
+
+def test_register_returns_503_when_hashing_is_saturated(client: TestClient, monkeypatch):
+    monkeypatch.setattr(security, "password_hasher", PasswordHasher(workers=1, queue_size=0))
+    security.password_hasher.pending = security.password_hasher.max_pending
+
+    res = client.post("/auth/register", json={"username": "busy_user", "password": "StrongPass1"})
+    assert res.status_code == 503
+    assert res.headers["Retry-After"] == str(security.settings.password_hash_retry_after_seconds)
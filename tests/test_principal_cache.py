@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import time
+import uuid
+
+import jwt
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.cache import TTLCache
+from app.config import get_settings
+from app.security import invalidate_user, principal_cache
+
+settings = get_settings()
+
+
+def _register_and_login(client: TestClient) -> tuple[str, str]:
+    username = f"user_{uuid.uuid4().hex[:8]}"
+    password = "StrongPass123!"
+    res = client.post("/auth/register", json={"username": username, "password": password})
+    assert res.status_code == 201, res.text
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    assert res.status_code == 200, res.text
+    return res.json()["access_token"], username
+
+
+def _auth(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_repeated_requests_hit_the_cache(client: TestClient):
+    token, _ = _register_and_login(client)
+
+    for _ in range(3):
+        assert client.get("/api/posts", headers=_auth(token)).status_code == 200
+
+    assert principal_cache.stats() == {"size": 1, "hits": 2, "misses": 1}
+
+
+def test_invalidation_drops_deleted_user(client: TestClient, db_session: Session):
+    token, username = _register_and_login(client)
+    assert client.get("/api/posts", headers=_auth(token)).status_code == 200
+
+    db_session.query(models.User).filter(models.User.username == username).delete()
+    db_session.commit()
+    assert invalidate_user(username) == 1
+
+    res = client.get("/api/posts", headers=_auth(token))
+    assert res.status_code == 401
+    assert "User not found" in res.json()["detail"]
+
+
+def test_entries_do_not_outlive_token_expiry(client: TestClient):
+    _, username = _register_and_login(client)
+    token = jwt.encode(
+        {"sub": username, "exp": int(time.time()) + 1},
+        settings.secret_key,
+        algorithm=settings.jwt_algorithm,
+    )
+    assert client.get("/api/posts", headers=_auth(token)).status_code == 200
+
+    time.sleep(1.1)
+    res = client.get("/api/posts", headers=_auth(token))
+    assert res.status_code == 401
+    assert "Invalid token" in res.json()["detail"]
+
+
+def test_ttl_cache_is_size_bounded_and_lru():
+    now = [0.0]
+    cache: TTLCache[str] = TTLCache(maxsize=2, clock=lambda: now[0])
+    cache.set("a", "A", expires_at=10)
+    cache.set("b", "B", expires_at=10)
+    assert cache.get("a") == "A"
+    cache.set("c", "C", expires_at=10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    now[0] = 10
+    assert cache.get("a") is None
+    assert len(cache) == 1
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import pstats
+import uuid
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.profiling import ProfilingMiddleware
+
+
+def _profiled_client(directory: Path, **options) -> TestClient:
+    # Dependency overrides live on the app, so the `client` fixture's test database is used.
+    return TestClient(ProfilingMiddleware(app, directory, **options))
+
+
+def _auth_headers(http: TestClient) -> dict[str, str]:
+    username = f"user_{uuid.uuid4().hex[:8]}"
+    password = "StrongPass123!"
+    http.post("/auth/register", json={"username": username, "password": password})
+    res = http.post("/auth/login", json={"username": username, "password": password})
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+def test_header_triggers_profile_dump(client: TestClient, tmp_path: Path):
+    http = _profiled_client(tmp_path)
+    headers = _auth_headers(http)
+    assert list(tmp_path.iterdir()) == []
+
+    res = http.get("/api/posts", headers={**headers, "X-Profile": "1"})
+    assert res.status_code == 200
+
+    (summary_path,) = tmp_path.glob("*.json")
+    summary = json.loads(summary_path.read_text())
+    assert summary["method"] == "GET"
+    assert summary["route"] == "/api/posts"
+    assert summary["status"] == 200
+    assert summary["db_queries"] > 0
+    assert summary["wall_seconds"] > 0
+
+    stats = pstats.Stats(str(summary_path.with_suffix(".pstats")))
+    assert stats.total_calls > 0
+    for line in summary_path.with_suffix(".collapsed").read_text().splitlines():
+        stack, _, count = line.rpartition(" ")
+        assert stack and int(count) > 0
+
+
+def test_token_must_match_when_configured(client: TestClient, tmp_path: Path):
+    http = _profiled_client(tmp_path, token="s3cret")  # noqa: S106
+    http.get("/api/stats", headers={"X-Profile": "1"})
+    assert list(tmp_path.iterdir()) == []
+
+    http.get("/api/stats", headers={"X-Profile": "s3cret"})
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_sample_rate_profiles_requests_without_header(client: TestClient, tmp_path: Path):
+    _profiled_client(tmp_path, sample_rate=0.0).get("/api/stats")
+    assert list(tmp_path.iterdir()) == []
+
+    _profiled_client(tmp_path, sample_rate=1.0).get("/api/stats")
+    assert {path.suffix for path in tmp_path.iterdir()} == {".json", ".pstats", ".collapsed"}
+
+
+def test_middleware_not_installed_by_default():
+    assert all(m.cls is not ProfilingMiddleware for m in app.user_middleware)
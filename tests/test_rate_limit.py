@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app import ratelimit
+from app.metrics import auth_attempts
+from app.ratelimit import TokenBucketLimiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=1.0, burst=3, maxsize=10, clock=clock)
+
+    assert [limiter.acquire("k") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("k") == 1.0
+
+    clock.now += 1.0
+    assert limiter.acquire("k") == 0.0
+    assert limiter.acquire("other") == 0.0
+
+
+def test_store_is_bounded_and_evicts_idle_keys():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=1.0, burst=1, maxsize=2, clock=clock)
+
+    limiter.acquire("idle")
+    limiter.acquire("busy")
+    limiter.acquire("busy")
+    limiter.acquire("new")
+
+    assert len(limiter) == 2
+    assert limiter.evictions == 1
+    # "busy" survived eviction and is still throttled.
+    assert limiter.acquire("busy") > 0
+
+
+def test_repeated_bad_logins_are_rejected_before_hashing(client: TestClient, monkeypatch):
+    client.post("/auth/register", json={"username": "victim", "password": "Password123!"})
+    monkeypatch.setattr(
+        ratelimit,
+        "username_limiter",
+        TokenBucketLimiter(rate=0.01, burst=2, maxsize=10),
+    )
+    verified = []
+
+    async def fake_verify(plain: str, hashed: str) -> bool:
+        verified.append(plain)
+        return False
+
+    monkeypatch.setattr("app.routers.auth.verify_password_async", fake_verify)
+    rejected_before = auth_attempts.value(endpoint="login", outcome="rejected")
+
+    statuses = [
+        client.post("/auth/login", json={"username": "victim", "password": "guess"}).status_code
+        for _ in range(4)
+    ]
+
+    assert statuses == [401, 401, 429, 429]
+    assert len(verified) == 2
+    assert auth_attempts.value(endpoint="login", outcome="rejected") == rejected_before + 2
+
+
+def test_client_ip_is_limited_across_usernames(client: TestClient, monkeypatch):
+    monkeypatch.setattr(ratelimit, "ip_limiter", TokenBucketLimiter(rate=0.01, burst=1, maxsize=10))
+
+    first = client.post("/auth/register", json={"username": "spray_1", "password": "Password1!"})
+    second = client.post("/auth/register", json={"username": "spray_2", "password": "Password1!"})
+
+    assert first.status_code == 201
+    assert second.status_code == 429
+    assert int(second.headers["Retry-After"]) >= 1
+
+
+def test_username_buckets_have_a_fixed_size_key(client: TestClient):
+    res = client.post("/auth/login", json={"username": "x" * 2_000_000, "password": "guess"})
+    assert res.status_code == 422
+
+    client.post("/auth/login", json={"username": "Someone" * 14, "password": "guess"})
+    assert len(ratelimit.username_limiter) == 1
+    assert ratelimit.username_key("Someone" * 14) == ratelimit.username_key("someone" * 14)
+    assert len(ratelimit.username_key("Someone" * 14)) == 16
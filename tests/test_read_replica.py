@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import db as db_module
+from app.db import READ_YOUR_WRITES_HEADER, make_async_engine
+
+PRIMARY_PATH = "./test.db"
+REPLICA_PATH = "./test_replica.db"
+
+
+def _sync_replica() -> None:
+    """Stand-in for replication: copy the primary file onto the replica."""
+    with sqlite3.connect(PRIMARY_PATH) as source, sqlite3.connect(REPLICA_PATH) as target:
+        source.backup(target)
+
+
+@pytest.fixture()
+def replica(monkeypatch) -> Generator[None, None, None]:
+    _sync_replica()
+    replica_engine = make_async_engine(f"sqlite:///{REPLICA_PATH}", poolclass=NullPool)
+    factory = async_sessionmaker(bind=replica_engine, autoflush=False, expire_on_commit=False)
+    monkeypatch.setattr(db_module, "get_read_async_sessionmaker", lambda: factory)
+    yield
+    Path(REPLICA_PATH).unlink(missing_ok=True)
+
+
+def _register_and_login(client, username: str, password: str) -> str:
+    client.post("/auth/register", json={"username": username, "password": password})
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    assert res.status_code == 200
+    return res.json()["access_token"]
+
+
+def _auth(token: str, **extra: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}", **extra}
+
+
+def test_reads_come_from_the_replica(client, replica):
+    token = _register_and_login(client, "replica_reader", "Password123!")
+    _sync_replica()
+
+    res = client.post(
+        "/api/posts", json={"title": "Fresh", "content": "Body"}, headers=_auth(token)
+    )
+    assert res.status_code == 201
+
+    # The write landed on the primary only; the replica has not caught up yet.
+    assert client.get("/api/posts", headers=_auth(token)).json()["items"] == []
+
+    _sync_replica()
+    items = client.get("/api/posts", headers=_auth(token)).json()["items"]
+    assert [item["title"] for item in items] == ["Fresh"]
+
+
+def test_read_your_writes_header_forces_the_primary(client, replica):
+    token = _register_and_login(client, "replica_writer", "Password123!")
+    _sync_replica()
+    client.post("/api/posts", json={"title": "Mine", "content": "Body"}, headers=_auth(token))
+
+    res = client.get("/api/posts", headers=_auth(token, **{READ_YOUR_WRITES_HEADER: "1"}))
+
+    assert [item["title"] for item in res.json()["items"]] == ["Mine"]
+    stale = client.get("/api/posts", headers=_auth(token, **{READ_YOUR_WRITES_HEADER: "0"}))
+    assert stale.json()["items"] == []
+
+
+def test_current_user_is_resolved_on_the_replica(client, replica):
+    # Registered on the primary, not yet replicated.
+    token = _register_and_login(client, "lagging_user", "Password123!")
+
+    assert client.get("/api/posts", headers=_auth(token)).status_code == 401
+
+    res = client.get("/api/posts", headers=_auth(token, **{READ_YOUR_WRITES_HEADER: "true"}))
+    assert res.status_code == 200
+
+
+def test_without_a_replica_reads_use_the_primary(client):
+    assert db_module.get_read_async_sessionmaker() is None
+    token = _register_and_login(client, "primary_only", "Password123!")
+    client.post("/api/posts", json={"title": "Direct", "content": "Body"}, headers=_auth(token))
+
+    items = client.get("/api/posts", headers=_auth(token)).json()["items"]
+
+    assert [item["title"] for item in items] == ["Direct"]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import bleach
+import pytest
+
+from app import sanitizer
+
+FRAGMENTS = [
+    "plain words ",
+    "<b>bold</b>",
+    "<script>alert(1)</script>",
+    '<a href="javascript:alert(1)">x</a>',
+    '<a href="https://example.com" title="t">link</a>',
+    "<img src=x onerror=alert(1)>",
+    "<!-- comment -->",
+    "&amp; &lt; &#x3C; &bogus; & ",
+    "a < b > c ",
+    "<div><p>nested</p></div>",
+    "</unclosed",
+    "\r\n",
+    "\t\n",
+    "\x00\x01\x0b\x0c\x1f\x7f\x85",
+    "кириллица ",
+    "🎉 emoji ",
+    "￾￿\ud800",
+]
+
+
+def _random_text(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 8)):
+        if rng.random() < 0.7:
+            parts.append(rng.choice(FRAGMENTS))
+        else:
+            parts.append("".join(chr(rng.randint(0, 0x2FFF)) for _ in range(rng.randint(1, 5))))
+    return "".join(parts)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_clean_matches_bleach_on_random_text(seed):
+    rng = random.Random(seed)
+    for _ in range(400):
+        value = _random_text(rng)
+        assert sanitizer.clean(value) == bleach.clean(value, strip=True), repr(value)
+
+
+def test_clean_many_matches_clean_and_keeps_order():
+    rng = random.Random(42)
+    values = [_random_text(rng) for _ in range(500)]
+
+    assert sanitizer.clean_many(values) == [bleach.clean(value, strip=True) for value in values]
+
+
+def test_fast_path_only_skips_text_bleach_leaves_unchanged():
+    # Every code point bleach would alter must send the text through the cleaner.
+    for code_point in [*range(0, 0x3000), 0xFFFD, 0xFFFF, 0x1F600, sys.maxunicode]:
+        value = f"a{chr(code_point)}b"
+        if not sanitizer.needs_cleaning(value):
+            assert bleach.clean(value, strip=True) == value, hex(code_point)
+
+
+def test_plain_text_skips_the_cleaner(monkeypatch):
+    monkeypatch.setattr(sanitizer, "_get_cleaner", lambda: pytest.fail("cleaner was built"))
+
+    assert sanitizer.clean("Just words, quotes \" ' and unicode ✓") == (
+        "Just words, quotes \" ' and unicode ✓"
+    )
+
+
+def test_cleaner_is_reused_per_thread():
+    def cleaner_id() -> int:
+        sanitizer.clean("<b>x</b>")
+        return id(sanitizer._get_cleaner())
+
+    assert cleaner_id() == cleaner_id()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(cleaner_id).result() != cleaner_id()
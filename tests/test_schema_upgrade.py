@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine, inspect, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app import models
+from app.db import create_schema, get_async_db, make_async_engine
+from app.main import app
+from app.pagination import keyset_statement
+from app.search import fts_available, search_posts
+from app.security import get_password_hash
+from app.serialization import post_row_to_dict, select_post_rows
+
+# The schema as the first release created it, before any column or index was added.
+BASELINE_DDL = [
+    "CREATE TABLE users (id INTEGER NOT NULL PRIMARY KEY, username VARCHAR(100) NOT NULL, "
+    "password_hash VARCHAR(255) NOT NULL, "
+    "created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL)",
+    "CREATE UNIQUE INDEX ix_users_username ON users (username)",
+    "CREATE INDEX ix_users_id ON users (id)",
+    "CREATE TABLE posts (id INTEGER NOT NULL PRIMARY KEY, title VARCHAR(200) NOT NULL, "
+    "content TEXT NOT NULL, created_at DATETIME NOT NULL, "
+    "owner_id INTEGER NOT NULL REFERENCES users (id))",
+    "CREATE INDEX ix_posts_id ON posts (id)",
+    "INSERT INTO users (id, username, password_hash) VALUES (1, 'alice', 'x'), (2, 'bob', 'x')",
+    "INSERT INTO posts (title, content, created_at, owner_id) VALUES "
+    "('a', '<img src=x onerror=alert(1)>a', '2024-01-01 10:00:00', 1), "
+    "('b', 'b', '2024-01-02 10:00:00', 1), "
+    "('c', 'c', '2024-01-03 10:00:00', 2)",
+]
+
+
+@pytest.fixture()
+def baseline_engine(tmp_path: Path) -> Iterator[Engine]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    with engine.begin() as conn:
+        for statement in BASELINE_DDL:
+            conn.exec_driver_sql(statement)
+    yield engine
+    engine.dispose()
+
+
+def test_create_schema_adds_indexes_to_existing_tables(baseline_engine: Engine):
+    create_schema(baseline_engine)
+    create_schema(baseline_engine)  # idempotent
+
+    indexes = {index["name"] for index in inspect(baseline_engine).get_indexes("posts")}
+    assert "ix_posts_created_at_id" in indexes
+
+
+def test_create_schema_adds_the_sanitizer_version_column(baseline_engine: Engine):
+    create_schema(baseline_engine)
+
+    columns = {column["name"] for column in inspect(baseline_engine).get_columns("posts")}
+    assert "sanitizer_version" in columns
+    with baseline_engine.connect() as conn:
+        rows = conn.execute(select_post_rows().order_by(models.Post.id)).all()
+    # Rows from before the column existed are NULL, so they are sanitized on output.
+    assert rows[0].sanitizer_version is None
+    assert post_row_to_dict(rows[0])["content"] == "a"
+
+
+def test_upgraded_database_searches_existing_posts_through_fts(baseline_engine: Engine):
+    create_schema(baseline_engine)
+    create_schema(baseline_engine)  # the index is not rebuilt twice
+    with baseline_engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO posts (title, content, created_at, owner_id) "
+            "VALUES ('later', 'c', '2024-01-04 10:00:00', 2)"
+        )
+
+    async def run() -> tuple[bool, list[int]]:
+        upgraded_engine = make_async_engine(str(baseline_engine.url), poolclass=NullPool)
+        try:
+            async with async_sessionmaker(bind=upgraded_engine)() as db:
+                found = await search_posts(db, ["c"], limit=10, offset=0)
+                return await fts_available(db), sorted(post.id for post in found)
+        finally:
+            await upgraded_engine.dispose()
+
+    assert asyncio.run(run()) == (True, [3, 4])
+
+
+def test_create_schema_adds_and_reconciles_the_post_counters(baseline_engine: Engine):
+    create_schema(baseline_engine)
+    create_schema(baseline_engine)  # no reconcile once the columns exist
+
+    with baseline_engine.connect() as conn:
+        counts = dict(conn.execute(select(models.User.username, models.User.post_count)).all())
+        totals = conn.execute(select(models.FeedState.post_count, models.FeedState.last_post_at))
+        assert counts == {"alice": 2, "bob": 1}
+        assert tuple(totals.one()) == (3, datetime(2024, 1, 3, 10, 0))
+
+
+def test_login_works_against_an_upgraded_database(client: TestClient, baseline_engine: Engine):
+    create_schema(baseline_engine)
+    password_hash = get_password_hash("Password123!")
+    with baseline_engine.begin() as conn:
+        conn.execute(update(models.User).values(password_hash=password_hash))
+    upgraded_engine = make_async_engine(str(baseline_engine.url), poolclass=NullPool)
+    upgraded = async_sessionmaker(bind=upgraded_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with upgraded() as session:
+            yield session
+
+    # The client fixture clears dependency overrides on teardown.
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    res = client.post("/auth/login", json={"username": "alice", "password": "Password123!"})
+    assert res.status_code == 200, res.text
+
+
+@pytest.mark.parametrize(
+    ("owner_id", "index"), [(1, "ix_posts_owner_created_id"), (None, "ix_posts_created_at_id")]
+)
+def test_upgraded_database_pages_through_the_indexes(
+    baseline_engine: Engine, owner_id: int | None, index: str
+):
+    create_schema(baseline_engine)
+
+    stmt = select_post_rows()
+    if owner_id is not None:
+        stmt = stmt.where(models.Post.owner_id == owner_id)
+    stmt = keyset_statement(stmt, models.Post, None, 10)
+    sql = str(stmt.compile(baseline_engine, compile_kwargs={"literal_binds": True}))
+    with baseline_engine.connect() as conn:
+        details = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+    assert any(index in detail for detail in details), details
+    assert not any("TEMP B-TREE" in detail for detail in details), details
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app import search
+
+
+def _register_and_login(client: TestClient) -> str:
+    username = f"user_{uuid.uuid4().hex[:8]}"
+    password = "StrongPass123!"
+    res = client.post("/auth/register", json={"username": username, "password": password})
+    assert res.status_code == 201, res.text
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    assert res.status_code == 200, res.text
+    return res.json()["access_token"]
+
+
+def _auth(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _seed(client: TestClient, token: str) -> None:
+    posts = [
+        {"title": "Gardening tips", "content": "How to grow tomatoes"},
+        {"title": "Tomatoes everywhere", "content": "A tomatoes recipe"},
+        {"title": "Unrelated", "content": "Nothing to see"},
+    ]
+    res = client.post("/api/posts/batch", headers=_auth(token), json=posts)
+    assert res.status_code == 201, res.text
+
+
+def _titles(res) -> list[str]:
+    assert res.status_code == 200, res.text
+    return [item["title"] for item in res.json()["items"]]
+
+
+def test_search_ranks_title_matches_first(client: TestClient):
+    token = _register_and_login(client)
+    _seed(client, token)
+
+    res = client.get("/api/posts/search", headers=_auth(token), params={"q": "tomatoes"})
+    assert _titles(res) == ["Tomatoes everywhere", "Gardening tips"]
+
+
+def test_search_index_follows_inserts_and_requires_all_terms(client: TestClient):
+    token = _register_and_login(client)
+    _seed(client, token)
+    client.post("/api/posts", headers=_auth(token), json={"title": "Fresh", "content": "basil"})
+
+    assert _titles(
+        client.get("/api/posts/search", headers=_auth(token), params={"q": "basil"})
+    ) == ["Fresh"]
+    assert _titles(
+        client.get("/api/posts/search", headers=_auth(token), params={"q": "grow tomatoes"})
+    ) == ["Gardening tips"]
+
+
+def test_search_paginates(client: TestClient):
+    token = _register_and_login(client)
+    _seed(client, token)
+
+    first = client.get(
+        "/api/posts/search", headers=_auth(token), params={"q": "tomatoes", "limit": 1}
+    )
+    cursor = first.json()["next_cursor"]
+    assert _titles(first) == ["Tomatoes everywhere"]
+    second = client.get(
+        "/api/posts/search",
+        headers=_auth(token),
+        params={"q": "tomatoes", "limit": 1, "cursor": cursor},
+    )
+    assert _titles(second) == ["Gardening tips"]
+    assert second.json()["next_cursor"] is None
+
+
+@pytest.mark.parametrize("query", ['"', "tomatoes OR", "NEAR(", "col:x", "*"])
+def test_fts_syntax_in_query_is_matched_literally(client: TestClient, query: str):
+    token = _register_and_login(client)
+    _seed(client, token)
+    res = client.get("/api/posts/search", headers=_auth(token), params={"q": query})
+    assert res.status_code == 200, res.text
+
+
+def test_search_falls_back_without_fts5(client: TestClient, monkeypatch):
+    token = _register_and_login(client)
+    _seed(client, token)
+
+    async def unavailable(db) -> bool:
+        return False
+
+    monkeypatch.setattr(search, "fts_available", unavailable)
+    res = client.get("/api/posts/search", headers=_auth(token), params={"q": "TOMATOES"})
+    assert sorted(_titles(res)) == ["Gardening tips", "Tomatoes everywhere"]
+
+
+def test_search_uses_the_fts_index(db_session: Session):
+    plan = db_session.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT posts.id FROM posts JOIN posts_fts "
+            "ON posts_fts.rowid = posts.id WHERE posts_fts MATCH 'x' ORDER BY bm25(posts_fts)"
+        )
+    ).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "VIRTUAL TABLE INDEX" in details
+    assert "SCAN posts " not in f"{details} "
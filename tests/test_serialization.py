@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import random
+from datetime import UTC, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app import schemas
+from app.serialization import encode_post_page
+
+TEXTS = [
+    "plain",
+    "Hello <b>World</b>",
+    "<script>alert(1)</script> safe",
+    "кириллица и emoji 🎉",
+    'quotes " and \\ backslash',
+    "ampersand &amp; entity",
+    "line\nbreak\ttab",
+]
+
+
+def _random_row(rng: random.Random, row_id: int) -> SimpleNamespace:
+    created_at = datetime(2024, 1, 1) + timedelta(
+        seconds=rng.randint(0, 10**7), microseconds=rng.choice([0, 1, 120000, 999999])
+    )
+    tz = rng.choice([None, UTC, timezone(timedelta(hours=3))])
+    if tz is not None:
+        created_at = created_at.replace(tzinfo=tz)
+    return SimpleNamespace(
+        id=row_id,
+        owner_id=rng.randint(1, 5),
+        title=rng.choice(TEXTS),
+        content=rng.choice(TEXTS),
+        created_at=created_at,
+        sanitizer_version=rng.choice([None, schemas.SANITIZER_VERSION]),
+    )
+
+
+def test_fast_path_matches_post_page_byte_for_byte():
+    rng = random.Random(1234)
+    for cursor in (None, "next-cursor"):
+        rows = [_random_row(rng, row_id) for row_id in range(200)]
+        expected = schemas.PostPage(items=rows, next_cursor=cursor).model_dump_json().encode()
+        assert encode_post_page(rows, cursor) == expected
+
+
+def test_fast_path_sanitizes_legacy_rows_only():
+    row = SimpleNamespace(
+        id=1,
+        owner_id=1,
+        title="<div>t</div>",
+        content="<script>x</script>",
+        created_at=datetime(2024, 1, 1),
+        sanitizer_version=None,
+    )
+    assert b"<script" not in encode_post_page([row], None)
+
+    row.sanitizer_version = schemas.SANITIZER_VERSION
+    assert b"<div>t</div>" in encode_post_page([row], None)
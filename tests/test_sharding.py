@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from conftest import TEST_DATABASE_URL, engine
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import NullPool
+
+from app import models
+from app.coalescer import ShardedPostWriteCoalescer
+from app.main import app
+from app.sharding import (
+    MAX_SHARDS,
+    PostShards,
+    create_shard_schema,
+    get_post_shards,
+    rebalance_posts,
+    shard_for,
+)
+
+posts = models.Post.__table__
+
+
+def _shard_urls(directory: Path, count: int) -> list[str]:
+    return [f"sqlite:///{directory / f'shard{index}.db'}" for index in range(count)]
+
+
+def _use_shards(urls: list[str]) -> PostShards:
+    for url in urls:
+        shard_engine = create_engine(url)
+        create_shard_schema(shard_engine)
+        shard_engine.dispose()
+    shards = PostShards(urls, poolclass=NullPool)
+    app.dependency_overrides[get_post_shards] = lambda: shards
+    return shards
+
+
+def _stored(url: str) -> list[tuple[int, int]]:
+    shard_engine = create_engine(url)
+    try:
+        with shard_engine.connect() as conn:
+            return [tuple(row) for row in conn.execute(select(posts.c.id, posts.c.owner_id))]
+    finally:
+        shard_engine.dispose()
+
+
+@pytest.fixture()
+def shards(client: TestClient, tmp_path: Path) -> Generator[PostShards, None, None]:
+    # The client fixture clears dependency overrides on teardown.
+    yield _use_shards(_shard_urls(tmp_path, 3))
+
+
+def _register_and_login(client: TestClient) -> tuple[dict[str, str], int]:
+    username = f"user_{uuid.uuid4().hex[:8]}"
+    password = "StrongPass123!"
+    res = client.post("/auth/register", json={"username": username, "password": password})
+    assert res.status_code == 201, res.text
+    user_id = res.json()["id"]
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    assert res.status_code == 200, res.text
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}, user_id
+
+
+def _populate(client: TestClient, users: int = 6) -> list[tuple[dict[str, str], int]]:
+    accounts = [_register_and_login(client) for _ in range(users)]
+    for number, (headers, _) in enumerate(accounts):
+        res = client.post(
+            "/api/posts", headers=headers, json={"title": f"shared {number}", "content": "body"}
+        )
+        assert res.status_code == 201, res.text
+        batch = [{"title": f"batch {number}", "content": "shared body"}] * 2
+        res = client.post("/api/posts/batch", headers=headers, json=batch)
+        assert res.status_code == 201, res.text
+    return accounts
+
+
+def test_posts_are_written_to_their_owners_shard(client: TestClient, shards: PostShards):
+    accounts = _populate(client)
+    assert len({shards.index_for(user_id) for _, user_id in accounts}) > 1
+
+    seen_ids = set()
+    for index, url in enumerate(shards.urls):
+        for post_id, owner_id in _stored(url):
+            assert shards.index_for(owner_id) == index
+            assert post_id % MAX_SHARDS == index
+            seen_ids.add(post_id)
+    assert len(seen_ids) == 3 * len(accounts)
+    with engine.connect() as conn:
+        assert conn.scalar(select(func.count()).select_from(posts)) == 0
+
+
+def test_feed_merges_shards_newest_first(client: TestClient, shards: PostShards):
+    accounts = _populate(client)
+    headers = accounts[0][0]
+
+    first = client.get("/api/posts", headers=headers, params={"limit": 4})
+    pages, cursor = [first.json()], first.json()["next_cursor"]
+    while cursor:
+        page = client.get("/api/posts", headers=headers, params={"limit": 4, "cursor": cursor})
+        pages.append(page.json())
+        cursor = page.json()["next_cursor"]
+    items = [item for page in pages for item in page["items"]]
+    assert len(items) == 18
+    keys = [(item["created_at"], item["id"]) for item in items]
+    assert keys == sorted(keys, reverse=True)
+
+    totals = client.get("/api/stats", headers=headers).json()
+    assert totals["total_posts"] == 18
+    assert totals["last_post_at"] == items[0]["created_at"]
+
+    client.post("/api/posts", headers=headers, json={"title": "new", "content": "post"})
+    again = client.get("/api/posts", headers=headers, params={"limit": 4})
+    assert again.headers["ETag"] != first.headers["ETag"]
+    assert again.json()["items"][0]["title"] == "new"
+
+
+def test_user_timeline_and_stats_come_from_the_owners_shard(client: TestClient, shards: PostShards):
+    accounts = _populate(client, users=3)
+    headers, user_id = accounts[1]
+
+    timeline = client.get(f"/api/users/{user_id}/posts", headers=headers).json()["items"]
+    assert len(timeline) == 3
+    assert {item["owner_id"] for item in timeline} == {user_id}
+    mine = client.get("/api/users/me/posts", headers=headers).json()["items"]
+    assert mine == timeline
+
+    stats = client.get(f"/api/users/{user_id}/stats", headers=headers).json()
+    assert stats["post_count"] == 3
+    assert stats["last_post_at"] == timeline[0]["created_at"]
+
+
+def test_export_and_search_span_shards(client: TestClient, shards: PostShards, monkeypatch):
+    from app.routers import posts as posts_router
+
+    monkeypatch.setattr(posts_router.settings, "export_chunk_size", 2)
+    accounts = _populate(client, users=4)
+    headers = accounts[0][0]
+
+    res = client.get("/api/posts/export", headers=headers)
+    exported = [json.loads(line) for line in res.text.splitlines()]
+    assert len(exported) == 12
+    keys = [(item["created_at"], item["id"]) for item in exported]
+    assert keys == sorted(keys)
+
+    found, cursor = [], None
+    while True:
+        params = {"q": "shared", "limit": 3, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/posts/search", headers=headers, params=params).json()
+        found += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(found) == 12
+    assert len({item["id"] for item in found}) == 12
+
+
+def test_sharded_coalescer_writes_each_post_to_its_owners_shard(
+    client: TestClient, shards: PostShards
+):
+    owners = [_register_and_login(client)[1] for _ in range(4)]
+
+    async def submit() -> list[tuple[int, object]]:
+        coalescer = ShardedPostWriteCoalescer(shards, window_seconds=0.01, max_batch=8)
+        return await asyncio.gather(
+            *(
+                coalescer.submit({"title": "c", "content": "d", "owner_id": owner})
+                for owner in owners
+                for _ in range(2)
+            )
+        )
+
+    created = asyncio.run(submit())
+    assert len({post_id for post_id, _ in created}) == 8
+    for index, url in enumerate(shards.urls):
+        assert all(shards.index_for(owner) == index for _, owner in _stored(url))
+    assert sum(len(_stored(url)) for url in shards.urls) == 8
+
+
+def test_rebalance_moves_posts_to_their_new_home(client: TestClient, tmp_path: Path):
+    # Start unsharded, then switch to two shards and grow to three.
+    accounts = _populate(client, users=6)
+    headers = accounts[0][0]
+    before = client.get("/api/posts", headers=headers, params={"limit": 100})
+    original = {item["id"]: item for item in before.json()["items"]}
+
+    two = _shard_urls(tmp_path, 2)
+    report = rebalance_posts(two, [TEST_DATABASE_URL], batch_size=5)
+    assert report["moved"] == 18
+    assert sum(report["posts"]) == 18
+    _use_shards(two)
+    after = client.get("/api/posts", headers=headers, params={"limit": 100})
+    assert after.json()["items"] == before.json()["items"]
+    assert after.headers["ETag"] != before.headers["ETag"]
+
+    three = _shard_urls(tmp_path, 3)
+    expected_moves = sum(1 for item in original.values() if shard_for(item["owner_id"], 3) == 2)
+    report = rebalance_posts(three)
+    assert report["moved"] == expected_moves
+    shards = _use_shards(three)
+    for index, url in enumerate(three):
+        assert all(shard_for(owner, 3) == index for _, owner in _stored(url))
+    assert client.get("/api/stats", headers=headers).json()["total_posts"] == 18
+
+    res = client.post("/api/posts", headers=headers, json={"title": "later", "content": "post"})
+    assert res.json()["id"] > max(original)
+    assert res.json()["id"] % MAX_SHARDS == shards.index_for(accounts[0][1])
+
+    # Rerunning after a finished rebalance is a no-op.
+    assert rebalance_posts(three)["moved"] == 0
+
+
+def test_jump_hash_is_balanced_and_moves_few_owners():
+    owners = range(1, 20001)
+    four = [shard_for(owner, 4) for owner in owners]
+    five = [shard_for(owner, 5) for owner in owners]
+    assert all(abs(four.count(index) - 5000) < 500 for index in range(4))
+    moved = [after for before, after in zip(four, five, strict=True) if before != after]
+    assert set(moved) == {4}
+    assert abs(len(moved) - 4000) < 400
+
+
+def test_shard_writes_without_returning(client: TestClient, shards: PostShards, monkeypatch):
+    for factory in shards.session_factories:
+        dialect = factory.kw["bind"].dialect
+        monkeypatch.setattr(dialect, "update_returning", False)
+        monkeypatch.setattr(dialect, "insert_executemany_returning_sort_by_parameter_order", False)
+    headers, user_id = _register_and_login(client)
+
+    batch = [{"title": f"batch {number}", "content": "body"} for number in range(3)]
+    res = client.post("/api/posts/batch", headers=headers, json=batch)
+    assert res.status_code == 201, res.text
+    ids = [item["id"] for item in res.json()["items"]]
+
+    home = shards.index_for(user_id)
+    assert sorted(ids) == sorted(post_id for post_id, _ in _stored(shards.urls[home]))
+    assert all(post_id % MAX_SHARDS == home for post_id in ids)
+    assert len(set(ids)) == 3
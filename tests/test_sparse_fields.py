@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from conftest import async_engine
+from fastapi.testclient import TestClient
+from sqlalchemy import event, update
+
+from app import models
+
+
+def _register_and_login(client: TestClient, username: str, password: str) -> str:
+    client.post("/auth/register", json={"username": username, "password": password})
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    assert res.status_code == 200
+    return res.json()["access_token"]
+
+
+def _auth(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _seed(client: TestClient, token: str, count: int, content: str = "x" * 300) -> None:
+    batch = [{"title": f"Post {idx}", "content": content} for idx in range(count)]
+    assert client.post("/api/posts/batch", headers=_auth(token), json=batch).status_code == 201
+
+
+def _list_statements(client: TestClient, token: str, params: dict) -> tuple[dict, list[str]]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM posts" in statement:
+            statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        res = client.get("/api/posts", headers=_auth(token), params=params)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    assert res.status_code == 200, res.text
+    return res.json(), statements
+
+
+def test_fields_trim_items_and_skip_content_in_sql(client: TestClient):
+    token = _register_and_login(client, "sparse", "Password123!")
+    _seed(client, token, 3)
+
+    page, statements = _list_statements(client, token, {"fields": "title, id,created_at"})
+
+    assert [set(item) for item in page["items"]] == [{"id", "title", "created_at"}] * 3
+    assert statements and not any("posts.content" in statement for statement in statements)
+
+
+def test_sparse_pages_still_paginate(client: TestClient):
+    token = _register_and_login(client, "sparse_pages", "Password123!")
+    _seed(client, token, 5)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"fields": "id", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/posts", headers=_auth(token), params=params).json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) == 5
+
+
+def test_preview_truncates_content(client: TestClient):
+    token = _register_and_login(client, "previewer", "Password123!")
+    _seed(client, token, 1, content="é" * 50 + "tail")
+
+    page, statements = _list_statements(client, token, {"preview": 10})
+
+    assert page["items"][0]["content"] == "é" * 10
+    assert page["items"][0]["title"] == "Post 0"
+    assert any("substr(posts.content" in statement for statement in statements)
+
+
+def test_preview_of_legacy_rows_is_sanitized_before_truncation(client: TestClient, db_session):
+    token = _register_and_login(client, "legacy_preview", "Password123!")
+    _seed(client, token, 1)
+    db_session.execute(
+        update(models.Post).values(content="<div>" + "y" * 20 + "</div>", sanitizer_version=None)
+    )
+    db_session.commit()
+
+    page = client.get("/api/posts", headers=_auth(token), params={"preview": 5}).json()
+
+    assert page["items"][0]["content"] == "yyyyy"
+
+
+def test_unknown_fields_are_rejected(client: TestClient):
+    token = _register_and_login(client, "typo", "Password123!")
+
+    res = client.get("/api/posts", headers=_auth(token), params={"fields": "id,password_hash"})
+
+    assert res.status_code == 422
+    assert "password_hash" in res.json()["detail"]
+
+
+def test_views_get_their_own_etags(client: TestClient):
+    token = _register_and_login(client, "etags", "Password123!")
+    _seed(client, token, 1)
+
+    full = client.get("/api/posts", headers=_auth(token))
+    sparse = client.get(
+        "/api/posts",
+        headers={**_auth(token), "If-None-Match": full.headers["ETag"]},
+        params={"fields": "id"},
+    )
+
+    assert sparse.status_code == 200
+    assert sparse.headers["ETag"] != full.headers["ETag"]
+
+
+def test_user_timeline_accepts_fields(client: TestClient):
+    token = _register_and_login(client, "timeline_fields", "Password123!")
+    _seed(client, token, 2)
+
+    res = client.get("/api/users/me/posts", headers=_auth(token), params={"fields": "title"})
+
+    assert [set(item) for item in res.json()["items"]] == [{"title"}] * 2
+
+
+def test_openapi_lists_every_item_field_as_optional(client: TestClient):
+    spec = client.get("/openapi.json").json()
+
+    for path in ("/api/posts", "/api/users/me/posts", "/api/users/{user_id}/posts"):
+        schema = spec["paths"][path]["get"]["responses"]["200"]["content"]["application/json"]
+        assert schema["schema"]["$ref"].endswith("/SparsePostPage")
+    item = spec["components"]["schemas"]["PostItem"]
+    assert set(item["properties"]) == {"id", "title", "content", "owner_id", "created_at"}
+    assert "required" not in item
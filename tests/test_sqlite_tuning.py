@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+
+from app.config import Settings
+from app.db import make_async_engine, make_engine
+
+PRAGMAS = ["journal_mode", "synchronous", "busy_timeout", "cache_size", "temp_store"]
+
+
+def _read_pragmas(connection) -> dict[str, object]:
+    return {name: connection.execute(text(f"PRAGMA {name}")).scalar() for name in PRAGMAS}
+
+
+def test_tuning_profile_is_applied_on_connect(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'tuned.db'}", tuning=True)
+    with engine.connect() as connection:
+        values = _read_pragmas(connection)
+    engine.dispose()
+
+    # synchronous=NORMAL is 1, temp_store=MEMORY is 2.
+    assert values == {
+        "journal_mode": "wal",
+        "synchronous": 1,
+        "busy_timeout": 5000,
+        "cache_size": -64000,
+        "temp_store": 2,
+    }
+
+
+def test_tuning_profile_applies_to_async_engine(tmp_path):
+    engine = make_async_engine(
+        f"sqlite:///{tmp_path / 'tuned.db'}", tuning=True, poolclass=NullPool
+    )
+
+    async def read() -> dict[str, object]:
+        async with engine.connect() as connection:
+            return await connection.run_sync(_read_pragmas)
+
+    values = asyncio.run(read())
+    asyncio.run(engine.dispose())
+    assert values["journal_mode"] == "wal"
+    assert values["busy_timeout"] == 5000
+
+
+def test_tuning_is_off_unless_enabled(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'plain.db'}", tuning=False)
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+    engine.dispose()
+
+
+def test_pragma_values_are_validated():
+    with pytest.raises(ValidationError):
+        Settings(sqlite_journal_mode="WAL; DROP TABLE users")
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+IMPORT_PROBE = """
+import json, sys
+import app.main
+print(json.dumps(sorted(name for name in ("bleach", "html5lib", "passlib.context")
+                        if name in sys.modules)))
+"""
+
+
+def test_importing_the_app_has_no_side_effects(tmp_path):
+    database = tmp_path / "cold.db"
+    env = {**os.environ, "APP_DATABASE_URL": f"sqlite:///{database}"}
+
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], capture_output=True, text=True, env=env, check=True
+    )
+
+    assert json.loads(result.stdout) == []
+    assert not database.exists()
+
+
+def test_init_db_command_creates_the_schema(tmp_path):
+    database = tmp_path / "cli.db"
+    env = {**os.environ, "APP_DATABASE_URL": f"sqlite:///{database}"}
+
+    result = subprocess.run(
+        [sys.executable, "-m", "app.cli", "init-db"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    assert "Schema is up to date" in result.stdout
+    assert database.exists()
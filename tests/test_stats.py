@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+from conftest import TestingAsyncSessionLocal, async_engine, engine
+from fastapi.testclient import TestClient
+from sqlalchemy import event, update
+
+from app import models
+from app.coalescer import PostWriteCoalescer
+from app.stats import reconcile_stats
+
+
+def _register_and_login(client: TestClient) -> tuple[str, int]:
+    username = f"user_{uuid.uuid4().hex[:8]}"
+    password = "StrongPass123!"
+    res = client.post("/auth/register", json={"username": username, "password": password})
+    assert res.status_code == 201, res.text
+    user_id = res.json()["id"]
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    assert res.status_code == 200, res.text
+    return res.json()["access_token"], user_id
+
+
+def _auth(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_counters_follow_every_write_path(client: TestClient):
+    token, user_id = _register_and_login(client)
+    other_token, other_id = _register_and_login(client)
+
+    single = client.post("/api/posts", headers=_auth(token), json={"title": "a", "content": "b"})
+    batch = [{"title": f"t{idx}", "content": "b"} for idx in range(3)]
+    client.post("/api/posts/batch", headers=_auth(other_token), json=batch)
+
+    async def coalesced() -> None:
+        coalescer = PostWriteCoalescer(TestingAsyncSessionLocal, window_seconds=0.01, max_batch=8)
+        await asyncio.gather(
+            coalescer.submit({"title": "c", "content": "d", "owner_id": user_id}),
+            coalescer.submit({"title": "e", "content": "f", "owner_id": other_id}),
+        )
+
+    asyncio.run(coalesced())
+
+    mine = client.get(f"/api/users/{user_id}/stats", headers=_auth(token)).json()
+    theirs = client.get(f"/api/users/{other_id}/stats", headers=_auth(token)).json()
+    totals = client.get("/api/stats", headers=_auth(token)).json()
+    assert mine["post_count"] == 2
+    assert mine["last_post_at"] > single.json()["created_at"]
+    assert theirs["post_count"] == 4
+    assert totals["total_posts"] == 6
+    assert totals["last_post_at"] == max(mine["last_post_at"], theirs["last_post_at"])
+
+
+def test_stats_endpoint_does_not_scan_posts(client: TestClient):
+    token, _ = _register_and_login(client)
+    client.post("/api/posts", headers=_auth(token), json={"title": "a", "content": "b"})
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        res = client.get("/api/stats", headers=_auth(token))
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    assert res.json()["total_posts"] == 1
+    assert not any("FROM posts" in statement for statement in statements)
+
+
+def test_user_stats_for_unknown_user_is_404(client: TestClient):
+    token, _ = _register_and_login(client)
+    assert client.get("/api/users/999999/stats", headers=_auth(token)).status_code == 404
+
+
+def test_reconcile_rebuilds_drifted_counters(client: TestClient, db_session):
+    token, user_id = _register_and_login(client)
+    batch = [{"title": f"t{idx}", "content": "b"} for idx in range(2)]
+    client.post("/api/posts/batch", headers=_auth(token), json=batch)
+    db_session.execute(update(models.User).values(post_count=42, last_post_at=None))
+    db_session.execute(update(models.FeedState).values(post_count=0))
+    db_session.commit()
+
+    with engine.begin() as conn:
+        assert reconcile_stats(conn) == {"users_fixed": 1}
+    with engine.begin() as conn:
+        assert reconcile_stats(conn) == {"users_fixed": 0}
+
+    assert client.get(f"/api/users/{user_id}/stats", headers=_auth(token)).json()["post_count"] == 2
+    assert client.get("/api/stats", headers=_auth(token)).json()["total_posts"] == 2
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from conftest import async_engine
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def _register_and_login(client: TestClient) -> tuple[str, int]:
+    username = f"user_{uuid.uuid4().hex[:8]}"
+    password = "StrongPass123!"
+    res = client.post("/auth/register", json={"username": username, "password": password})
+    assert res.status_code == 201, res.text
+    user_id = res.json()["id"]
+    res = client.post("/auth/login", json={"username": username, "password": password})
+    assert res.status_code == 200, res.text
+    return res.json()["access_token"], user_id
+
+
+def _auth(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _create(client: TestClient, token: str, *titles: str) -> None:
+    batch = [{"title": title, "content": "body"} for title in titles]
+    assert client.post("/api/posts/batch", headers=_auth(token), json=batch).status_code == 201
+
+
+@contextmanager
+def _captured_post_queries() -> Iterator[list[tuple[str, tuple]]]:
+    queries: list[tuple[str, tuple]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT") and "FROM posts" in statement:
+            queries.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield queries
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+def _assert_index_only_plan(db_session: Session, statement: str, parameters: tuple, index: str):
+    plan = db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    details = [row[-1] for row in plan]
+    assert any(index in detail for detail in details), details
+    assert not any(detail.startswith("SCAN posts") for detail in details), details
+    assert not any("TEMP B-TREE" in detail for detail in details), details
+
+
+def test_user_timeline_only_lists_that_users_posts(client: TestClient):
+    alice, alice_id = _register_and_login(client)
+    bob, _ = _register_and_login(client)
+    _create(client, alice, "a1", "a2", "a3")
+    _create(client, bob, "b1")
+
+    res = client.get(f"/api/users/{alice_id}/posts", headers=_auth(bob), params={"limit": 2})
+    assert res.status_code == 200
+    page = res.json()
+    assert [item["title"] for item in page["items"]] == ["a3", "a2"]
+
+    res = client.get(
+        f"/api/users/{alice_id}/posts",
+        headers=_auth(bob),
+        params={"limit": 2, "cursor": page["next_cursor"]},
+    )
+    assert [item["title"] for item in res.json()["items"]] == ["a1"]
+    assert res.json()["next_cursor"] is None
+
+    mine = client.get("/api/users/me/posts", headers=_auth(bob))
+    assert [item["title"] for item in mine.json()["items"]] == ["b1"]
+
+
+def test_unknown_user_is_404(client: TestClient):
+    token, _ = _register_and_login(client)
+    res = client.get("/api/users/9999/posts", headers=_auth(token))
+    assert res.status_code == 404
+
+
+def test_timeline_queries_use_the_owner_index(client: TestClient, db_session: Session):
+    token, user_id = _register_and_login(client)
+    _create(client, token, "one", "two", "three")
+    first = client.get(f"/api/users/{user_id}/posts", headers=_auth(token), params={"limit": 1})
+
+    with _captured_post_queries() as queries:
+        client.get(
+            f"/api/users/{user_id}/posts",
+            headers=_auth(token),
+            params={"limit": 1, "cursor": first.json()["next_cursor"]},
+        )
+
+    assert len(queries) == 1
+    _assert_index_only_plan(db_session, *queries[0], index="ix_posts_owner_created_id")
+
+
+def test_feed_queries_use_the_feed_index(client: TestClient, db_session: Session):
+    token, _ = _register_and_login(client)
+    _create(client, token, "one", "two", "three")
+    first = client.get("/api/posts", headers=_auth(token), params={"limit": 1})
+
+    with _captured_post_queries() as queries:
+        client.get(
+            "/api/posts",
+            headers=_auth(token),
+            params={"limit": 1, "cursor": first.json()["next_cursor"]},
+        )
+
+    assert len(queries) == 1
+    _assert_index_only_plan(db_session, *queries[0], index="ix_posts_created_at_id")
+    assert db_session.query(models.Post).count() == 3
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from conftest import TestingAsyncSessionLocal, async_engine
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+
+from app import models
+from app.coalescer import PostWriteCoalescer, get_post_coalescer
+from app.main import app
+from app.metrics import post_write_batch_size
+
+
+def _post(index: int, owner_id: int = 1) -> dict:
+    return {"title": f"Post {index}", "content": "Body", "owner_id": owner_id}
+
+
+def _seed_owner(db_session) -> None:
+    db_session.add(models.User(id=1, username="writer", password_hash="unused"))  # noqa: S106
+    db_session.commit()
+
+
+# False stands for backends such as MySQL, where the ORM inserts the batch row by row.
+@pytest.mark.parametrize("ordered_returning", [True, False])
+def test_concurrent_submits_share_transactions(db_session, monkeypatch, ordered_returning: bool):
+    monkeypatch.setattr(
+        async_engine.dialect,
+        "insert_executemany_returning_sort_by_parameter_order",
+        ordered_returning,
+    )
+    _seed_owner(db_session)
+    batches_before = post_write_batch_size.count()
+
+    async def burst() -> list:
+        coalescer = PostWriteCoalescer(TestingAsyncSessionLocal, window_seconds=0.05, max_batch=4)
+        return await asyncio.gather(*(coalescer.submit(_post(idx)) for idx in range(10)))
+
+    results = asyncio.run(burst())
+
+    assert post_write_batch_size.count() - batches_before == 3
+    assert len({post_id for post_id, _ in results}) == 10
+    stored = {post.id: post for post in db_session.query(models.Post)}
+    for index, (post_id, created_at) in enumerate(results):
+        assert stored[post_id].title == f"Post {index}"
+        assert stored[post_id].created_at == created_at
+
+
+def test_lone_submit_is_flushed_after_the_window(db_session):
+    _seed_owner(db_session)
+
+    async def single() -> tuple:
+        coalescer = PostWriteCoalescer(TestingAsyncSessionLocal, window_seconds=0.01, max_batch=64)
+        return await coalescer.submit(_post(0))
+
+    post_id, _ = asyncio.run(single())
+
+    assert db_session.get(models.Post, post_id) is not None
+
+
+def test_a_failed_batch_fails_every_caller(db_session):
+    _seed_owner(db_session)
+
+    async def broken() -> list:
+        coalescer = PostWriteCoalescer(TestingAsyncSessionLocal, window_seconds=0.05, max_batch=2)
+        bad = {**_post(1), "title": None}
+        return await asyncio.gather(
+            coalescer.submit(_post(0)), coalescer.submit(bad), return_exceptions=True
+        )
+
+    results = asyncio.run(broken())
+
+    assert all(isinstance(result, IntegrityError) for result in results)
+    assert db_session.query(models.Post).count() == 0
+
+
+@pytest.fixture()
+def coalesced_client(client: TestClient):
+    coalescer = PostWriteCoalescer(TestingAsyncSessionLocal, window_seconds=0.005, max_batch=8)
+    app.dependency_overrides[get_post_coalescer] = lambda: coalescer
+    return client
+
+
+def test_create_post_goes_through_the_coalescer(coalesced_client: TestClient):
+    client = coalesced_client
+    client.post("/auth/register", json={"username": "grouped", "password": "Password123!"})
+    token = client.post(
+        "/auth/login", json={"username": "grouped", "password": "Password123!"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    etag = client.get("/api/posts", headers=headers).headers["ETag"]
+
+    res = client.post(
+        "/api/posts", json={"title": "Hi", "content": "<b>there</b>"}, headers=headers
+    )
+
+    assert res.status_code == 201
+    body = res.json()
+    assert {body["title"], body["content"]} == {"Hi", "<b>there</b>"}
+    assert body["id"] and body["created_at"]
+    listed = client.get("/api/posts", headers=headers)
+    assert listed.headers["ETag"] != etag
+    assert [item["id"] for item in listed.json()["items"]] == [body["id"]]
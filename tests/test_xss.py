@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
 
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models, schemas
 
 
 def _register_and_login(client: TestClient) -> str:
@@ -77,10 +81,45 @@ def test_listing_only_returns_sanitized_content(client: TestClient):
     )
     res = client.get("/api/posts", headers=_auth(token))
     assert res.status_code == 200
-    for post in res.json():
+    for post in res.json()["items"]:
         sanitized_title = post["title"].lower()
         sanitized_content = post["content"].lower()
         assert "<script" not in sanitized_title
         assert "<script" not in sanitized_content
         assert "onerror" not in sanitized_title
         assert "onerror" not in sanitized_content
+
+
+def test_output_sanitizer_is_skipped_only_for_current_policy_rows():
+    row = models.Post(
+        id=1,
+        title="<div>raw</div>",
+        content="<script>x</script>",
+        owner_id=1,
+        created_at=datetime(2024, 1, 1),
+    )
+
+    legacy = schemas.PostOut.model_validate(row)
+    assert legacy.title == "raw"
+    assert "<script" not in legacy.content
+
+    row.sanitizer_version = schemas.SANITIZER_VERSION
+    trusted = schemas.PostOut.model_validate(row)
+    assert trusted.title == "<div>raw</div>"
+
+
+def test_legacy_rows_are_sanitized_on_read(client: TestClient, db_session: Session):
+    token = _register_and_login(client)
+    owner = db_session.query(models.User).one()
+    db_session.add(
+        models.Post(
+            title="<svg onload=alert(1)>t", content="<script>x</script>c", owner_id=owner.id
+        )
+    )
+    db_session.commit()
+
+    res = client.get("/api/posts", headers=_auth(token))
+    assert res.status_code == 200
+    (post,) = res.json()["items"]
+    assert "<svg" not in post["title"].lower()
+    assert "<script" not in post["content"].lower()